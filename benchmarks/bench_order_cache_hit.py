@@ -0,0 +1,65 @@
+"""CPU cost of serving GET /orders/{id}/ from the cache.
+
+Compares the old hit path (json.loads -> OrderResponse(**data) -> FastAPI
+response_model validation and serialization) with the current one, which
+splits the cached entry and returns the stored bytes as they are.
+
+    python -m benchmarks.bench_order_cache_hit
+"""
+
+import json
+import timeit
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+
+from src.order_management_service.schemas.order import OrderResponse
+from src.order_management_service.services.order_service import (
+    _from_cache_entry,
+    _to_cache_entry,
+)
+
+
+def _sample_order(items: int) -> OrderResponse:
+    return OrderResponse(
+        id=uuid4(),
+        user_id=42,
+        items=[
+            {"product_id": i, "quantity": i % 5 + 1, "price": 9.99}
+            for i in range(items)
+        ],
+        total_price=99.9,
+        status="PENDING",
+        created_at=datetime.now(UTC).replace(tzinfo=None),
+    )
+
+
+def _legacy_hit(cached: str) -> bytes:
+    response = OrderResponse(**json.loads(cached))
+    validated = OrderResponse.model_validate(response.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def _raw_hit(cached: str) -> bytes:
+    return _from_cache_entry(cached).body.encode()
+
+
+def main(number: int = 20_000) -> None:
+    for items in (1, 10, 50):
+        order = _sample_order(items)
+        legacy_cached = json.dumps(order.model_dump(mode="json"))
+        raw_cached = _to_cache_entry(order)
+
+        legacy = timeit.timeit(
+            lambda cached=legacy_cached: _legacy_hit(cached), number=number
+        )
+        raw = timeit.timeit(lambda cached=raw_cached: _raw_hit(cached), number=number)
+        print(
+            f"items={items:>3}  legacy={legacy / number * 1e6:8.2f} us/hit  "
+            f"raw={raw / number * 1e6:6.2f} us/hit  speedup={legacy / raw:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,515 @@
+"""Load test for the API with swappable local backends.
+
+Runs the FastAPI app in-process behind httpx's ASGI transport, drives one
+of the workloads below with N concurrent workers for a fixed duration and
+writes a JSON report with throughput and latency percentiles per endpoint.
+
+    python -m benchmarks.load_test --scenario read_heavy --concurrency 64 \\
+        --duration 20 --db sqlite --cache fakeredis --output report.json
+
+Backends:
+    --db     sqlite (fresh file) or postgres (--database-url)
+    --cache  memory (dict stand-ins, no rate limiting), fakeredis
+             (needs the fakeredis package) or redis (REDIS_URL)
+Kafka is always the in-memory producer.
+
+Scenarios: read_heavy, create_burst, login_storm, mixed, consumer.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+SCENARIOS = ("read_heavy", "create_burst", "login_storm", "mixed", "consumer")
+PASSWORD = "bench-password"
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS, default="mixed")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--orders-per-user", type=int, default=25)
+    parser.add_argument("--db", choices=("sqlite", "postgres"), default="sqlite")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument(
+        "--cache", choices=("memory", "fakeredis", "redis"), default="memory"
+    )
+    parser.add_argument("--hash-rounds", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+    if args.db == "postgres" and not args.database_url:
+        parser.error("--db postgres needs --database-url or BENCH_DATABASE_URL")
+    return args
+
+
+def _configure_environment(args: argparse.Namespace) -> None:
+    # Settings are read at import time, so this must run before the app
+    # modules are imported.
+    if args.db == "sqlite":
+        os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///./bench_load.db"
+    else:
+        os.environ["DATABASE_URL"] = args.database_url
+    if args.hash_rounds is not None:
+        os.environ["PASSWORD_HASH_ROUNDS"] = str(args.hash_rounds)
+    os.environ.setdefault("RATE_LIMIT_LOGIN_REQUESTS", str(10**9))
+    os.environ.setdefault("RATE_LIMIT_ORDERS_REQUESTS", str(10**9))
+    os.environ.setdefault("OUTBOX_RELAY_POLL_INTERVAL_SECONDS", "0.05")
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    def record(self, name: str, elapsed: float, ok: bool) -> None:
+        if not self.recording:
+            return
+        self.latencies[name].append(elapsed)
+        if not ok:
+            self.errors[name] += 1
+
+    def report(self, duration: float) -> dict:
+        endpoints = {}
+        for name, values in sorted(self.latencies.items()):
+            values.sort()
+            endpoints[name] = {
+                "requests": len(values),
+                "errors": self.errors[name],
+                "throughput_rps": round(len(values) / duration, 2),
+                "mean_ms": round(sum(values) / len(values) * 1000, 3),
+                **{
+                    f"p{int(q * 100)}_ms": round(_percentile(values, q) * 1000, 3)
+                    for q in (0.5, 0.9, 0.99)
+                },
+                "max_ms": round(values[-1] * 1000, 3),
+            }
+        return endpoints
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    import httpx
+    from sqlalchemy import insert
+
+    from src.order_management_service.core import security as security_module
+    from src.order_management_service.core.database import Base, engine
+    from src.order_management_service.core.kafka import (
+        InMemoryProducer,
+        start_kafka_producer,
+        stop_kafka_producer,
+    )
+    from src.order_management_service.core.rate_limiter import (
+        login_rate_limiter,
+        orders_rate_limiter,
+    )
+    from src.order_management_service.core.redis import (
+        listen_order_cache_invalidations,
+        redis_client,
+    )
+    from src.order_management_service.core.security import (
+        get_password_hash,
+        run_token_revocation_sync,
+        shutdown_hash_executor,
+    )
+    from src.order_management_service.main import app
+    from src.order_management_service.models.order import Order
+    from src.order_management_service.models.user import User
+    from src.order_management_service.services import order_service
+    from src.order_management_service.services.outbox_relay import run_outbox_relay
+
+    random.seed(args.seed)
+    producer = InMemoryProducer()
+
+    if args.cache == "fakeredis":
+        try:
+            import fakeredis
+            from fakeredis.aioredis import FakeConnection
+        except ImportError:
+            sys.exit(
+                "--cache fakeredis needs the fakeredis package (pip install fakeredis[lua])"
+            )
+        from redis.asyncio import ConnectionPool
+
+        redis_client.connection_pool = ConnectionPool(
+            connection_class=FakeConnection,
+            server=fakeredis.FakeServer(),
+            decode_responses=True,
+        )
+    elif args.cache == "memory":
+        _install_memory_cache(order_service, security_module)
+
+        async def no_rate_limit() -> None:
+            return None
+
+        app.dependency_overrides[login_rate_limiter] = no_rate_limit
+        app.dependency_overrides[orders_rate_limiter] = no_rate_limit
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    hashed = get_password_hash(PASSWORD)
+    async with engine.begin() as conn:
+        users = (
+            (
+                await conn.execute(
+                    insert(User).returning(User.id),
+                    [
+                        {"email": f"bench{i}@example.com", "hashed_password": hashed}
+                        for i in range(args.users)
+                    ],
+                )
+            )
+            .scalars()
+            .all()
+        )
+        order_ids = (
+            await conn.execute(
+                insert(Order).returning(Order.id, Order.user_id),
+                [
+                    {
+                        "user_id": user_id,
+                        "items": [{"product_id": n, "quantity": 1, "price": 9.99}],
+                        "total_price": 9.99,
+                    }
+                    for user_id in users
+                    for n in range(args.orders_per_user)
+                ],
+            )
+        ).all()
+
+    await start_kafka_producer(producer)
+    background = [asyncio.create_task(run_outbox_relay())]
+    if args.cache != "memory":
+        background.append(asyncio.create_task(listen_order_cache_invalidations()))
+        background.append(asyncio.create_task(run_token_revocation_sync()))
+
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            tokens = {}
+            for index, user_id in enumerate(users):
+                response = await client.post(
+                    "/token/",
+                    data={
+                        "username": f"bench{index}@example.com",
+                        "password": PASSWORD,
+                    },
+                )
+                tokens[user_id] = response.json()["access_token"]
+            orders_by_user = defaultdict(list)
+            for order_id, user_id in order_ids:
+                orders_by_user[user_id].append(str(order_id))
+
+            context = {
+                "client": client,
+                "users": users,
+                "tokens": tokens,
+                "orders": orders_by_user,
+                "recorder": recorder,
+            }
+            if args.scenario == "consumer":
+                endpoints, measured = await _run_consumer_scenario(args, recorder)
+            else:
+                measured = await _drive(args, _WORKLOADS[args.scenario], context)
+                endpoints = recorder.report(measured)
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        await stop_kafka_producer()
+        shutdown_hash_executor()
+        await engine.dispose()
+        if args.db == "sqlite":
+            Path("bench_load.db").unlink(missing_ok=True)
+
+    return {
+        "revision": _git_revision(),
+        "started_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(args).items()
+            if key != "database_url"
+        },
+        "measured_seconds": round(measured, 3),
+        "kafka_messages": len(producer.messages),
+        "endpoints": endpoints,
+    }
+
+
+def _install_memory_cache(order_service, security_module) -> None:
+    cache: dict[str, str] = {}
+    revoked: set[str] = set()
+
+    async def get_order(order_id: str) -> str | None:
+        return cache.get(order_id)
+
+    async def get_orders(order_ids: list[str]) -> dict[str, str]:
+        return {
+            order_id: cache[order_id] for order_id in order_ids if order_id in cache
+        }
+
+    async def acquire_lock(order_id: str) -> str:
+        return "bench"
+
+    async def release_lock(order_id: str, token: str) -> None:
+        return None
+
+    async def set_order(order_id: str, data: str, ttl_seconds: int = 0) -> None:
+        cache[order_id] = data
+
+    async def set_orders(
+        entries: dict[str, str],
+        ttl_seconds: int = 0,
+        local: bool = True,
+        nx: bool = False,
+    ) -> None:
+        for order_id, data in entries.items():
+            if nx:
+                cache.setdefault(order_id, data)
+            else:
+                cache[order_id] = data
+
+    async def store_revocation(jti: str, expires_at: int) -> None:
+        revoked.add(jti)
+
+    async def is_revoked(jti: str) -> bool:
+        return jti in revoked
+
+    order_service.get_order_from_cache = get_order
+    order_service.get_orders_from_cache = get_orders
+    order_service.peek_order_in_cache = get_order
+    order_service.acquire_order_lock = acquire_lock
+    order_service.release_order_lock = release_lock
+    order_service.set_order_to_cache = set_order
+    order_service.set_orders_to_cache = set_orders
+    order_service.refresh_orders_cache = set_orders
+    security_module.store_token_revocation = store_revocation
+    security_module.is_token_revoked = is_revoked
+
+
+async def _timed(context: dict, name: str, request: Awaitable) -> None:
+    started = time.perf_counter()
+    try:
+        response = await request
+        ok = response.status_code < 400
+    except Exception:  # noqa: BLE001 - an app error is a failed request, not a crash
+        ok = False
+    context["recorder"].record(name, time.perf_counter() - started, ok)
+
+
+def _auth(context: dict, user_id: int) -> dict:
+    return {"Authorization": f"Bearer {context['tokens'][user_id]}"}
+
+
+async def _get_order(context: dict) -> None:
+    user_id = random.choice(context["users"])
+    order_id = random.choice(context["orders"][user_id])
+    await _timed(
+        context,
+        "GET /orders/{order_id}/",
+        context["client"].get(f"/orders/{order_id}/", headers=_auth(context, user_id)),
+    )
+
+
+async def _list_orders(context: dict) -> None:
+    user_id = random.choice(context["users"])
+    await _timed(
+        context,
+        "GET /orders/user/{user_id}/",
+        context["client"].get(
+            f"/orders/user/{user_id}/",
+            params={"limit": 20},
+            headers=_auth(context, user_id),
+        ),
+    )
+
+
+async def _create_order(context: dict) -> None:
+    user_id = random.choice(context["users"])
+    await _timed(
+        context,
+        "POST /orders/",
+        context["client"].post(
+            "/orders/",
+            json={
+                "items": [
+                    {"product_id": random.randint(1, 1000), "quantity": 1, "price": 5.0}
+                ],
+                "total_price": 5.0,
+            },
+            headers=_auth(context, user_id),
+        ),
+    )
+
+
+async def _login(context: dict) -> None:
+    index = random.randrange(len(context["users"]))
+    await _timed(
+        context,
+        "POST /token/",
+        context["client"].post(
+            "/token/",
+            data={"username": f"bench{index}@example.com", "password": PASSWORD},
+        ),
+    )
+
+
+def _weighted(*choices: tuple[Callable, int]) -> Callable:
+    actions = [action for action, weight in choices for _ in range(weight)]
+
+    async def step(context: dict) -> None:
+        await random.choice(actions)(context)
+
+    return step
+
+
+_WORKLOADS: dict[str, Callable[[dict], Awaitable[None]]] = {
+    "read_heavy": _weighted((_get_order, 9), (_list_orders, 1)),
+    "create_burst": _create_order,
+    "login_storm": _login,
+    "mixed": _weighted(
+        (_get_order, 14), (_list_orders, 3), (_create_order, 2), (_login, 1)
+    ),
+}
+
+
+async def _drive(
+    args: argparse.Namespace,
+    step: Callable[[dict], Awaitable[None]],
+    context: dict,
+) -> float:
+    stop_at = time.perf_counter() + args.warmup + args.duration
+
+    async def worker() -> None:
+        while time.perf_counter() < stop_at:
+            await step(context)
+
+    async def start_recording() -> float:
+        await asyncio.sleep(args.warmup)
+        context["recorder"].recording = True
+        return time.perf_counter()
+
+    recording_started, *_ = await asyncio.gather(
+        start_recording(),
+        *(worker() for _ in range(args.concurrency)),
+    )
+    return time.perf_counter() - recording_started
+
+
+async def _run_consumer_scenario(
+    args: argparse.Namespace,
+    recorder: Recorder,
+) -> tuple[dict, float]:
+    from aiokafka import ConsumerRecord, TopicPartition
+
+    from src.order_management_service.core.settings import CONSUMER_BATCH_SIZE
+    from src.order_management_service.services import order_consumer
+
+    class _EnqueueOnly:
+        async def kiq(self, order_id: str) -> None:
+            await asyncio.sleep(0)
+
+    class _SyntheticConsumer:
+        def __init__(self, partitions: int) -> None:
+            self.offsets = {
+                TopicPartition("new_order", p): 0 for p in range(partitions)
+            }
+
+        async def getmany(self, timeout_ms: int, max_records: int) -> dict:
+            per_partition = max(1, max_records // len(self.offsets))
+            batches = {}
+            for partition, offset in self.offsets.items():
+                batches[partition] = [
+                    ConsumerRecord(
+                        topic=partition.topic,
+                        partition=partition.partition,
+                        offset=offset + i,
+                        timestamp=0,
+                        timestamp_type=0,
+                        key=str(random.randrange(args.users)).encode(),
+                        value={"order_id": f"{partition.partition}-{offset + i}"},
+                        checksum=None,
+                        serialized_key_size=0,
+                        serialized_value_size=0,
+                        headers=(),
+                    )
+                    for i in range(per_partition)
+                ]
+                self.offsets[partition] += per_partition
+            return batches
+
+        async def commit(self, offsets: dict) -> None:
+            return None
+
+        def assignment(self) -> set:
+            return set(self.offsets)
+
+        def highwater(self, partition) -> int:
+            return self.offsets[partition]
+
+    order_consumer.process_order_task = _EnqueueOnly()
+    consumer = _SyntheticConsumer(partitions=args.concurrency)
+    listener = order_consumer.DrainingRebalanceListener()
+
+    recorder.recording = True
+    started = time.perf_counter()
+    messages = 0
+    while time.perf_counter() - started < args.duration:
+        batch_started = time.perf_counter()
+        messages += await order_consumer.process_next_batch(consumer, listener)
+        recorder.record("consumer batch", time.perf_counter() - batch_started, True)
+    measured = time.perf_counter() - started
+
+    endpoints = recorder.report(measured)
+    endpoints["consumer batch"]["messages_per_second"] = round(messages / measured, 2)
+    endpoints["consumer batch"]["batch_size"] = CONSUMER_BATCH_SIZE
+    return endpoints, measured
+
+
+if __name__ == "__main__":
+    arguments = _parse_args()
+    _configure_environment(arguments)
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    report = asyncio.run(main(arguments))
+    rendered = json.dumps(report, indent=2)
+    if arguments.output:
+        arguments.output.write_text(rendered + "\n")
+    print(rendered)
@@ -0,0 +1,71 @@
+"""add order query indexes
+
+Revision ID: 3c8e5d07b1f4
+Revises: 9732f912a517
+Create Date: 2026-10-18 21:04:11.802316
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c8e5d07b1f4"
+down_revision: str | Sequence[str] | None = "9732f912a517"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_orders_user_id_created_at",
+            "orders",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_orders_active_status",
+            "orders",
+            ["status", "created_at"],
+            unique=False,
+            postgresql_where=sa.text("status IN ('PENDING', 'PAID')"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_orders_user_id",
+            table_name="orders",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_orders_user_id",
+            "orders",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_orders_active_status",
+            table_name="orders",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_orders_user_id_created_at",
+            table_name="orders",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,61 @@
+"""orders items jsonb
+
+Revision ID: b41f6a9c2e73
+Revises: 3c8e5d07b1f4
+Create Date: 2026-10-18 21:37:52.114870
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b41f6a9c2e73"
+down_revision: str | Sequence[str] | None = "3c8e5d07b1f4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "orders",
+        "items",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using="items::jsonb",
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_orders_items",
+            "orders",
+            ["items"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"items": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_orders_items",
+            table_name="orders",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.alter_column(
+        "orders",
+        "items",
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using="items::json",
+    )
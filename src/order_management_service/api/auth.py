@@ -3,8 +3,13 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.order_management_service.core.database import get_db
-from src.order_management_service.core.rate_limiter import rate_limiter_dependency
+from src.order_management_service.core.rate_limiter import login_rate_limiter
+from src.order_management_service.core.security import (
+    get_current_token_payload,
+    revoke_token,
+)
 from src.order_management_service.schemas.auth import Token
 from src.order_management_service.schemas.user import UserCreate, UserResponse
 from src.order_management_service.services.auth_service import (
@@ -12,7 +17,6 @@ from src.order_management_service.services.auth_service import (
     register_user,
 )
 
-
 auth_router = APIRouter(
     prefix="",
     tags=["auth"],
@@ -42,7 +46,7 @@ async def register(
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: DbSession,
-    _rate_limit: Annotated[None, Depends(rate_limiter_dependency)],
+    _rate_limit: Annotated[None, Depends(login_rate_limiter)],
 ) -> Token:
     return await authenticate_user(
         db,
@@ -50,3 +54,14 @@ async def login_for_access_token(
             "Login", (), {"email": form_data.username, "password": form_data.password}
         )(),  # minimal wrapper
     )
+
+
+@auth_router.post(
+    "/logout/",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def logout(
+    token_payload: Annotated[dict, Depends(get_current_token_payload)],
+) -> None:
+    if token_payload.get("jti"):
+        await revoke_token(token_payload)
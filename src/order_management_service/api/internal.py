@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends
+
+from src.order_management_service.core.database import get_pool_stats
+from src.order_management_service.core.redis import get_order_cache_stats
+from src.order_management_service.core.security import (
+    get_current_user,
+    get_password_hash_stats,
+)
+from src.order_management_service.core.sql_profiler import get_recent_profiles
+
+internal_router = APIRouter(
+    prefix="/internal",
+    tags=["system"],
+    dependencies=[Depends(get_current_user)],
+)
+
+
+@internal_router.get(
+    "/cache/stats",
+    summary="Статистика попаданий в кеш заказов по уровням",
+)
+async def order_cache_stats() -> dict:
+    return get_order_cache_stats()
+
+
+@internal_router.get(
+    "/password-hash/stats",
+    summary="Очередь и латентность пула хеширования паролей",
+)
+async def password_hash_stats() -> dict:
+    return get_password_hash_stats()
+
+
+@internal_router.get(
+    "/db/pool",
+    summary="Загрузка пула соединений с БД и время ожидания соединения",
+)
+async def db_pool_stats() -> dict:
+    return get_pool_stats()
+
+
+@internal_router.get(
+    "/db/queries",
+    summary="SQL-профили последних запросов (при SQL_PROFILING_ENABLED=true)",
+)
+async def recent_query_profiles() -> list[dict]:
+    return get_recent_profiles()
@@ -1,25 +1,43 @@
+import json
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.order_management_service.core.database import get_db
-from src.order_management_service.core.rate_limiter import rate_limiter_dependency
+from src.order_management_service.core.rate_limiter import orders_rate_limiter
 from src.order_management_service.core.security import get_current_user
+from src.order_management_service.core.settings import (
+    ORDERS_PAGE_DEFAULT_LIMIT,
+    ORDERS_PAGE_MAX_LIMIT,
+)
+from src.order_management_service.models.order import OrderStatus
 from src.order_management_service.schemas.order import (
+    OrderBatchGet,
+    OrderBatchResponse,
+    OrderBulkCreate,
+    OrderBulkResponse,
     OrderCreate,
+    OrderPage,
     OrderResponse,
+    OrderStatusBatchUpdate,
     OrderUpdateStatus,
+    UtcDatetime,
 )
 from src.order_management_service.services.order_service import (
     create_order,
+    create_orders,
     get_order_by_id,
+    get_orders_by_ids,
     get_user_orders,
+    search_user_orders,
+    stream_user_orders,
     update_order_status,
+    update_order_statuses,
 )
 
-
 orders_router = APIRouter(
     prefix="/orders",
     tags=["orders"],
@@ -39,7 +57,7 @@ async def create_order_endpoint(
     order_data: OrderCreate,
     db: DbSession,
     current_user: CurrentUser,
-    _rate_limit: Annotated[None, Depends(rate_limiter_dependency)],
+    _rate_limit: Annotated[None, Depends(orders_rate_limiter)],
 ) -> OrderResponse:
     order = await create_order(
         db=db,
@@ -49,6 +67,72 @@ async def create_order_endpoint(
     return OrderResponse.model_validate(order)
 
 
+@orders_router.post(
+    "/bulk",
+    response_model=OrderBulkResponse,
+)
+async def create_orders_bulk_endpoint(
+    bulk_data: OrderBulkCreate,
+    db: DbSession,
+    current_user: CurrentUser,
+    _rate_limit: Annotated[None, Depends(orders_rate_limiter)],
+) -> OrderBulkResponse:
+    return await create_orders(
+        db=db,
+        user_id=current_user["id"],
+        orders=bulk_data.orders,
+    )
+
+
+@orders_router.post(
+    "/batch-get",
+    response_model=OrderBatchResponse,
+)
+async def batch_get_orders_endpoint(
+    batch_data: OrderBatchGet,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> Response:
+    orders, missing = await get_orders_by_ids(db, batch_data.ids)
+    if any(order.user_id != current_user["id"] for order in orders):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view these orders",
+        )
+    items = ",".join(order.body for order in orders)
+    missing_ids = json.dumps([str(order_id) for order_id in missing])
+    body = f'{{"items":[{items}],"missing":{missing_ids}}}'
+    return Response(content=body, media_type="application/json")
+
+
+@orders_router.get(
+    "/search",
+    response_model=OrderPage,
+)
+async def search_orders_endpoint(
+    db: DbSession,
+    current_user: CurrentUser,
+    product_id: int | None = None,
+    order_status: Annotated[OrderStatus | None, Query(alias="status")] = None,
+    created_from: UtcDatetime | None = None,
+    created_to: UtcDatetime | None = None,
+    limit: Annotated[int, Query(ge=1, le=ORDERS_PAGE_MAX_LIMIT)] = (
+        ORDERS_PAGE_DEFAULT_LIMIT
+    ),
+    cursor: str | None = None,
+) -> OrderPage:
+    return await search_user_orders(
+        db,
+        current_user["id"],
+        limit=limit,
+        cursor=cursor,
+        product_id=product_id,
+        order_status=order_status,
+        created_from=created_from,
+        created_to=created_to,
+    )
+
+
 @orders_router.get(
     "/{order_id}/",
     response_model=OrderResponse,
@@ -57,14 +141,26 @@ async def get_order_endpoint(
     order_id: UUID,
     db: DbSession,
     current_user: CurrentUser,
-) -> OrderResponse:
+) -> Response:
     order = await get_order_by_id(db, order_id)
     if order.user_id != current_user["id"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions to view this order",
         )
-    return order
+    return Response(content=order.body, media_type="application/json")
+
+
+@orders_router.patch(
+    "/status",
+    response_model=OrderBatchResponse,
+)
+async def update_order_statuses_endpoint(
+    batch_data: OrderStatusBatchUpdate,
+    db: DbSession,
+    _current_user: CurrentUser,
+) -> OrderBatchResponse:
+    return await update_order_statuses(db=db, changes=batch_data.updates)
 
 
 @orders_router.patch(
@@ -85,20 +181,42 @@ async def update_order_status_endpoint(
     return updated
 
 
+def _ensure_own_orders(user_id: int, current_user: dict) -> None:
+    if current_user["id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view these orders",
+        )
+
+
 @orders_router.get(
     "/user/{user_id}/",
-    response_model=list[OrderResponse],
+    response_model=OrderPage,
 )
 async def get_user_orders_endpoint(
     user_id: int,
     db: DbSession,
     current_user: CurrentUser,
-) -> list[OrderResponse]:
-    if current_user["id"] != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to view these orders",
-        )
+    limit: Annotated[int, Query(ge=1, le=ORDERS_PAGE_MAX_LIMIT)] = (
+        ORDERS_PAGE_DEFAULT_LIMIT
+    ),
+    cursor: str | None = None,
+) -> OrderPage:
+    _ensure_own_orders(user_id, current_user)
+    return await get_user_orders(db, user_id, limit=limit, cursor=cursor)
+
 
-    orders = await get_user_orders(db, user_id)
-    return [OrderResponse.model_validate(order) for order in orders]
+@orders_router.get(
+    "/user/{user_id}/stream",
+    response_class=StreamingResponse,
+)
+async def stream_user_orders_endpoint(
+    user_id: int,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> StreamingResponse:
+    _ensure_own_orders(user_id, current_user)
+    return StreamingResponse(
+        stream_user_orders(db, user_id),
+        media_type="application/x-ndjson",
+    )
@@ -1,13 +1,233 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import declarative_base
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+
+from redis.exceptions import RedisError
+from sqlalchemy import Select, event, exc, make_url, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from src.order_management_service.core.local_cache import LocalCache
+from src.order_management_service.core.metrics import (
+    CallbackMetric,
+    dependency_duration_seconds,
+)
+from src.order_management_service.core.redis import redis_client
+from src.order_management_service.core.settings import (
+    DATABASE_REPLICA_URL,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_REPLICA_CHECK_INTERVAL_SECONDS,
+    DB_REPLICA_MAX_LAG_SECONDS,
+    DB_REPLICA_STICKY_SECONDS,
+    DB_REPLICA_STICKY_USERS,
+    DB_STATEMENT_CACHE_SIZE,
+)
+from src.order_management_service.core.sql_profiler import record_statement
+
+logger = logging.getLogger(__name__)
+
+_POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# Pool name ("primary" / "replica") -> counters of that engine's pool.
+_pool_stats: dict[str, dict] = {}
+
+
+def _new_pool_stats() -> dict:
+    return {
+        "waiting": 0,
+        "checkouts": 0,
+        "timeouts": 0,
+        "wait_seconds_sum": 0.0,
+        "wait_buckets": {str(bucket): 0 for bucket in _POOL_WAIT_BUCKETS},
+    }
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    @property
+    def stats(self) -> dict:
+        # The pool's logging name is passed on by recreate(), so counters
+        # survive engine.dispose().
+        name = self._orig_logging_name or "primary"
+        return _pool_stats.setdefault(name, _new_pool_stats())
+
+    def connect(self) -> PoolProxiedConnection:
+        stats = self.stats
+        stats["waiting"] += 1
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            stats["timeouts"] += 1
+            raise
+        finally:
+            stats["waiting"] -= 1
+            elapsed = time.perf_counter() - started
+            stats["wait_seconds_sum"] += elapsed
+            for bucket in _POOL_WAIT_BUCKETS:
+                if elapsed <= bucket:
+                    stats["wait_buckets"][str(bucket)] += 1
+        stats["checkouts"] += 1
+        return connection
+
+
+def _connect_args(url: str) -> dict:
+    if make_url(url).drivername != "postgresql+asyncpg":
+        return {}
+    return {
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+    }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    operation = statement.lstrip().split(None, 1)[0].lower() if statement else "unknown"
+    dependency_duration_seconds.observe(elapsed, "sql", operation)
+    record_statement(statement, elapsed)
+
+
+def _handle_error(context) -> None:
+    started = (
+        context.connection.info.get("query_started") if context.connection else None
+    )
+    if started:
+        started.pop()
+
+
+def instrument_engine(async_engine: AsyncEngine) -> AsyncEngine:
+    sync_engine = async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    return async_engine
+
+
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    created = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedPool,
+        pool_logging_name=name,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=_connect_args(url),
+    )
+    return instrument_engine(created)
+
+
+engine = _create_engine(DATABASE_URL, "primary")
+replica_engine: AsyncEngine | None = (
+    _create_engine(DATABASE_REPLICA_URL, "replica") if DATABASE_REPLICA_URL else None
+)
+
+_replica_state: dict = {"healthy": False, "lag_seconds": None}
+
+db_user_id: ContextVar[int | None] = ContextVar("db_user_id", default=None)
+# Whether Redis holds a recent write by the request's user, loaded once per
+# request by bind_db_user(): a write made through any worker keeps the user's
+# reads on the primary. _sticky_users only saves the round trip in this worker.
+db_user_sticky: ContextVar[bool] = ContextVar("db_user_sticky", default=False)
+_sticky_users: LocalCache[bool] = LocalCache(
+    maxsize=DB_REPLICA_STICKY_USERS,
+    ttl_seconds=DB_REPLICA_STICKY_SECONDS,
+)
+
+
+def _sticky_key(user_id: int) -> str:
+    return f"db:sticky:{user_id}"
 
-from src.order_management_service.core.settings import DATABASE_URL
 
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+async def bind_db_user(user_id: int) -> None:
+    db_user_id.set(user_id)
+    if replica_engine is None:
+        return
+    if _sticky_users.get(str(user_id)) is not None:
+        db_user_sticky.set(True)
+        return
+    try:
+        sticky = bool(await redis_client.exists(_sticky_key(user_id)))
+    except RedisError:
+        logger.warning("Cannot read replica stickiness, routing reads to primary")
+        sticky = True
+    db_user_sticky.set(sticky)
+
+
+async def _mark_user_sticky(user_id: int) -> None:
+    _sticky_users.set(str(user_id), True)
+    try:
+        await redis_client.set(
+            _sticky_key(user_id),
+            1,
+            px=int(DB_REPLICA_STICKY_SECONDS * 1000),
+        )
+    except RedisError:
+        logger.warning("Cannot store replica stickiness for user %s", user_id)
+
+
+def _is_user_sticky() -> bool:
+    user_id = db_user_id.get()
+    return user_id is not None and (
+        db_user_sticky.get() or _sticky_users.get(str(user_id)) is not None
+    )
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw) -> Engine:
+        if replica_engine is None:
+            return engine.sync_engine
+        if self._flushing or (
+            clause is not None
+            and (not isinstance(clause, Select) or clause._for_update_arg is not None)
+        ):
+            self.info["wrote"] = True
+            if (user_id := db_user_id.get()) is not None:
+                self.info["sticky_user_id"] = user_id
+            return engine.sync_engine
+        if (
+            clause is None
+            or self.info.get("wrote")
+            or not _replica_state["healthy"]
+            or clause.get_execution_options().get("use_primary")
+            or _is_user_sticky()
+        ):
+            return engine.sync_engine
+        return replica_engine.sync_engine
+
+
+class RoutingAsyncSession(AsyncSession):
+    async def commit(self) -> None:
+        await super().commit()
+        user_id = self.sync_session.info.pop("sticky_user_id", None)
+        if user_id is not None:
+            await _mark_user_sticky(user_id)
+
 
 async_session_maker = async_sessionmaker(
     engine,
+    class_=RoutingAsyncSession,
     expire_on_commit=False,
+    sync_session_class=RoutingSession,
 )
 
 Base = declarative_base()
@@ -16,3 +236,102 @@ Base = declarative_base()
 async def get_db() -> AsyncSession:
     async with async_session_maker() as session:
         yield session
+
+
+def replica_reads_enabled() -> bool:
+    return replica_engine is not None and _replica_state["healthy"]
+
+
+_REPLICA_LAG_QUERY = text(
+    """
+    SELECT COALESCE(
+        CASE
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END,
+        0
+    )
+    """
+)
+
+
+async def check_replica() -> None:
+    try:
+        async with replica_engine.connect() as conn:
+            lag = float(
+                await asyncio.wait_for(
+                    conn.scalar(_REPLICA_LAG_QUERY),
+                    timeout=DB_REPLICA_CHECK_INTERVAL_SECONDS,
+                )
+            )
+    except (TimeoutError, exc.SQLAlchemyError, OSError):
+        if _replica_state["healthy"]:
+            logger.warning("Read replica is unavailable, routing reads to primary")
+        _replica_state.update(healthy=False, lag_seconds=None)
+        return
+
+    healthy = lag <= DB_REPLICA_MAX_LAG_SECONDS
+    if _replica_state["healthy"] and not healthy:
+        logger.warning("Read replica lags %.1fs, routing reads to primary", lag)
+    _replica_state.update(healthy=healthy, lag_seconds=lag)
+
+
+async def run_replica_health_check() -> None:
+    while True:
+        await check_replica()
+        await asyncio.sleep(DB_REPLICA_CHECK_INTERVAL_SECONDS)
+
+
+def _pools() -> dict[str, InstrumentedPool]:
+    pools = {"primary": engine.pool}
+    if replica_engine is not None:
+        pools["replica"] = replica_engine.pool
+    return pools
+
+
+def _pool_usage(pool: InstrumentedPool) -> dict:
+    stats = pool.stats
+    return {
+        **stats,
+        "wait_buckets": dict(stats["wait_buckets"]),
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "timeout_seconds": DB_POOL_TIMEOUT_SECONDS,
+    }
+
+
+def get_pool_stats() -> dict:
+    stats = {name: _pool_usage(pool) for name, pool in _pools().items()}
+    if "replica" in stats:
+        stats["replica"].update(_replica_state)
+    return stats
+
+
+def _collect_pool_stat(field: str) -> dict[tuple[str, ...], float]:
+    return {(name,): pool.stats[field] for name, pool in _pools().items()}
+
+
+CallbackMetric(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool.",
+    "gauge",
+    ("pool",),
+    lambda: {(name,): pool.checkedout() for name, pool in _pools().items()},
+)
+CallbackMetric(
+    "db_pool_waiting",
+    "Callers currently waiting for a pooled connection.",
+    "gauge",
+    ("pool",),
+    lambda: _collect_pool_stat("waiting"),
+)
+CallbackMetric(
+    "db_pool_timeouts_total",
+    "Connection checkouts that timed out.",
+    "counter",
+    ("pool",),
+    lambda: _collect_pool_stat("timeouts"),
+)
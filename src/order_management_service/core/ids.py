@@ -0,0 +1,41 @@
+import os
+import threading
+import time
+from uuid import UUID, uuid4
+
+from src.order_management_service.core.settings import ORDER_ID_VERSION
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> UUID:
+    # RFC 9562 UUIDv7: 48-bit unix ms timestamp, then a 12-bit counter
+    # (seeded randomly each ms) so ids from one process stay monotonic.
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2)) & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms += 1
+                _counter = 0
+        timestamp_ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8)) & 0x3FFF_FFFF_FFFF_FFFF
+    value = (
+        (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return UUID(int=value)
+
+
+def new_order_id() -> UUID:
+    return uuid7() if ORDER_ID_VERSION == 7 else uuid4()
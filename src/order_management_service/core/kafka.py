@@ -1,17 +1,87 @@
+import asyncio
 import json
+import logging
 
 from aiokafka import AIOKafkaProducer
 
-from src.order_management_service.core.settings import KAFKA_BOOTSTRAP_SERVERS
+from src.order_management_service.core.metrics import dependency_duration_seconds
+from src.order_management_service.core.settings import (
+    KAFKA_ACKS,
+    KAFKA_BOOTSTRAP_SERVERS,
+    KAFKA_COMPRESSION_TYPE,
+    KAFKA_LINGER_MS,
+    KAFKA_MAX_BATCH_SIZE,
+    KAFKA_SEND_WAIT,
+)
 
+logger = logging.getLogger(__name__)
 
-async def _get_producer() -> AIOKafkaProducer:
-    producer = AIOKafkaProducer(
+
+class InMemoryProducer:
+    def __init__(self) -> None:
+        self.messages: list[tuple[str, str | None, dict]] = []
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    async def send(
+        self,
+        topic: str,
+        value: dict,
+        key: str | None = None,
+    ) -> asyncio.Future:
+        self.messages.append((topic, key, value))
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(None)
+        return future
+
+
+_producer: AIOKafkaProducer | InMemoryProducer | None = None
+
+
+def _build_producer() -> AIOKafkaProducer:
+    return AIOKafkaProducer(
         bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
+        key_serializer=lambda k: k.encode("utf-8"),
         value_serializer=lambda v: json.dumps(v).encode("utf-8"),
+        linger_ms=KAFKA_LINGER_MS,
+        max_batch_size=KAFKA_MAX_BATCH_SIZE,
+        compression_type=KAFKA_COMPRESSION_TYPE,
+        acks=int(KAFKA_ACKS) if KAFKA_ACKS in ("0", "1") else KAFKA_ACKS,
     )
+
+
+async def start_kafka_producer(
+    producer: AIOKafkaProducer | InMemoryProducer | None = None,
+) -> None:
+    global _producer
+    if _producer is not None:
+        return
+    producer = producer or _build_producer()
     await producer.start()
-    return producer
+    _producer = producer
+
+
+async def stop_kafka_producer() -> None:
+    global _producer
+    if _producer is None:
+        return
+    producer, _producer = _producer, None
+    await producer.stop()
+
+
+def _log_send_failure(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Failed to deliver order event", exc_info=future.exception())
+
+
+def get_producer() -> AIOKafkaProducer | InMemoryProducer:
+    if _producer is None:
+        raise RuntimeError("Kafka producer is not started")
+    return _producer
 
 
 async def send_new_order_event(
@@ -20,16 +90,20 @@ async def send_new_order_event(
     total_price: float,
     status: str,
     items: list[dict],
-) -> None:
-    producer = await _get_producer()
-    try:
-        payload = {
-            "order_id": order_id,
-            "user_id": user_id,
-            "total_price": total_price,
-            "status": status,
-            "items": items,
-        }
-        await producer.send_and_wait("new_order", value=payload)
-    finally:
-        await producer.stop()
+    wait: bool = KAFKA_SEND_WAIT,
+) -> asyncio.Future | None:
+    payload = {
+        "order_id": order_id,
+        "user_id": user_id,
+        "total_price": total_price,
+        "status": status,
+        "items": items,
+    }
+    with dependency_duration_seconds.time("kafka", "send"):
+        future = await get_producer().send("new_order", value=payload, key=str(user_id))
+    if wait:
+        with dependency_duration_seconds.time("kafka", "ack"):
+            await future
+        return None
+    future.add_done_callback(_log_send_failure)
+    return future
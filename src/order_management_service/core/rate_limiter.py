@@ -1,22 +1,239 @@
-from fastapi import HTTPException, Request, status
+import asyncio
+import logging
+import math
+import time
+import weakref
+from dataclasses import dataclass
+from uuid import uuid4
 
+from fastapi import HTTPException, Request, Response, status
+from redis.exceptions import RedisError
+
+from src.order_management_service.core.metrics import rate_limit_rejections_total
 from src.order_management_service.core.redis import redis_client
 from src.order_management_service.core.settings import (
-    RATE_LIMIT_WINDOW_SECONDS,
-    RATE_LIMIT_REQUESTS,
+    RATE_LIMIT_ALGORITHM,
+    RATE_LIMIT_HYBRID_TOLERANCE,
+    RATE_LIMIT_LOGIN_REQUESTS,
+    RATE_LIMIT_LOGIN_WINDOW_SECONDS,
+    RATE_LIMIT_MODE,
+    RATE_LIMIT_ORDERS_REQUESTS,
+    RATE_LIMIT_ORDERS_WINDOW_SECONDS,
+    RATE_LIMIT_SYNC_INTERVAL_MS,
 )
 
+logger = logging.getLogger(__name__)
+
+# Both scripts return {allowed, remaining, retry_after_ms, reset_ms} and use the
+# Redis clock, so every worker agrees on the window regardless of local skew.
+_SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+redis.call("ZREMRANGEBYSCORE", KEYS[1], 0, now - window)
+local count = redis.call("ZCARD", KEYS[1])
+if count < limit then
+    redis.call("ZADD", KEYS[1], now, ARGV[3])
+    redis.call("PEXPIRE", KEYS[1], window)
+    count = count + 1
+    local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+    return {1, limit - count, 0, tonumber(oldest[2]) + window - now}
+end
+
+local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+local retry_after = tonumber(oldest[2]) + window - now
+return {0, 0, retry_after, retry_after}
+"""
+
+_TOKEN_BUCKET_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local interval = period / limit
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local tat = tonumber(redis.call("GET", KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+
+redis.call("SET", KEYS[1], new_tat, "PX", math.ceil(new_tat - now))
+local remaining = math.floor((period - (new_tat - now)) / interval)
+return {1, remaining, 0, math.ceil(new_tat - now)}
+"""
+
+_FIXED_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local reset = window - now % window
+
+local count = tonumber(redis.call("GET", KEYS[1]) or "0")
+if count >= limit then
+    return {0, 0, reset, reset}
+end
+count = redis.call("INCR", KEYS[1])
+if count == 1 then
+    redis.call("PEXPIRE", KEYS[1], reset)
+end
+return {1, limit - count, 0, reset}
+"""
+
+_SCRIPTS = {
+    "sliding_window": redis_client.register_script(_SLIDING_WINDOW_SCRIPT),
+    "token_bucket": redis_client.register_script(_TOKEN_BUCKET_SCRIPT),
+    "fixed_window": redis_client.register_script(_FIXED_WINDOW_SCRIPT),
+}
+
+_hybrid_limiters: weakref.WeakSet["RateLimiter"] = weakref.WeakSet()
+
+
+@dataclass
+class _LocalWindow:
+    window: int
+    synced: int = 0
+    pending: int = 0
+    in_flight: int = 0
 
-async def rate_limiter_dependency(request: Request) -> None:
-    client_ip = request.client.host
-    key = f"rate:{client_ip}"
 
-    current = await redis_client.incr(key)
-    if current == 1:
-        await redis_client.expire(key, RATE_LIMIT_WINDOW_SECONDS)
+class RateLimiter:
+    def __init__(
+        self,
+        name: str,
+        requests: int,
+        window_seconds: int,
+        algorithm: str = RATE_LIMIT_ALGORITHM,
+        mode: str = RATE_LIMIT_MODE,
+        tolerance: float = RATE_LIMIT_HYBRID_TOLERANCE,
+    ):
+        if algorithm not in _SCRIPTS:
+            raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+        if mode not in ("redis", "hybrid"):
+            raise ValueError(f"Unknown rate limit mode: {mode}")
+        # Local admission counts hits per fixed window; pairing it with the
+        # sliding window or GCRA would quietly allow 2x bursts at window edges.
+        if mode == "hybrid" and algorithm != "fixed_window":
+            raise ValueError("Hybrid rate limiting requires the fixed_window algorithm")
+        self.name = name
+        self.requests = requests
+        self.window_seconds = window_seconds
+        self.algorithm = algorithm
+        self.mode = mode
+        self._script = _SCRIPTS[algorithm]
+        # Each worker may admit this many requests before it must reconcile
+        # with Redis, so the global overshoot is at most workers * max_unsynced.
+        self.max_unsynced = max(1, math.floor(requests * tolerance))
+        self._local: dict[str, _LocalWindow] = {}
+        if mode == "hybrid":
+            _hybrid_limiters.add(self)
 
-    if current > RATE_LIMIT_REQUESTS:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many requests",
+    async def _check(self, key: str) -> tuple[bool, int, int, int]:
+        allowed, remaining, retry_after_ms, reset_ms = await self._script(
+            keys=[key],
+            args=[self.requests, self.window_seconds * 1000, uuid4().hex],
         )
+        return bool(allowed), int(remaining), int(retry_after_ms), int(reset_ms)
+
+    async def _check_local(self, key: str) -> tuple[bool, int, int, int]:
+        now = time.time()
+        window = int(now // self.window_seconds)
+        reset_ms = math.ceil(((window + 1) * self.window_seconds - now) * 1000)
+
+        state = self._local.get(key)
+        if state is None or state.window != window:
+            state = self._local[key] = _LocalWindow(window)
+        if state.pending >= self.max_unsynced:
+            try:
+                await self._flush([(key, state)])
+            except RedisError:
+                logger.warning("Rate limit reconciliation failed for %s", self.name)
+
+        used = state.synced + state.in_flight + state.pending
+        if used >= self.requests:
+            return False, 0, reset_ms, reset_ms
+        state.pending += 1
+        return True, self.requests - used - 1, 0, reset_ms
+
+    async def _flush(self, entries: list[tuple[str, _LocalWindow]]) -> None:
+        # Pending hits move to in_flight before the await, so a flush that
+        # starts meanwhile (inline or from sync()) never sends them again.
+        amounts = []
+        for _, state in entries:
+            amounts.append(state.pending)
+            state.in_flight += state.pending
+            state.pending = 0
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for (key, state), amount in zip(entries, amounts):
+                    pipe.incrby(f"{key}:{state.window}", amount)
+                    pipe.expire(f"{key}:{state.window}", self.window_seconds * 2)
+                results = await pipe.execute()
+        except BaseException:
+            for (_, state), amount in zip(entries, amounts):
+                state.in_flight -= amount
+                state.pending += amount
+            raise
+        for (_, state), amount, total in zip(entries, amounts, results[::2]):
+            state.in_flight -= amount
+            state.synced = max(state.synced, total)
+
+    async def sync(self) -> None:
+        window = int(time.time() // self.window_seconds)
+        pending = [(key, state) for key, state in self._local.items() if state.pending]
+        if pending:
+            await self._flush(pending)
+        for key in [key for key, state in self._local.items() if state.window < window]:
+            del self._local[key]
+
+    async def __call__(self, request: Request, response: Response) -> None:
+        key = f"rate:{self.name}:{request.client.host}"
+        if self.mode == "hybrid":
+            allowed, remaining, retry_after_ms, reset_ms = await self._check_local(key)
+        else:
+            allowed, remaining, retry_after_ms, reset_ms = await self._check(key)
+
+        headers = {
+            "X-RateLimit-Limit": str(self.requests),
+            "X-RateLimit-Remaining": str(max(remaining, 0)),
+            "X-RateLimit-Reset": str(math.ceil(reset_ms / 1000)),
+        }
+        if not allowed:
+            rate_limit_rejections_total.inc(self.name)
+            headers["Retry-After"] = str(max(math.ceil(retry_after_ms / 1000), 1))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers=headers,
+            )
+        response.headers.update(headers)
+
+
+login_rate_limiter = RateLimiter(
+    "login",
+    RATE_LIMIT_LOGIN_REQUESTS,
+    RATE_LIMIT_LOGIN_WINDOW_SECONDS,
+)
+orders_rate_limiter = RateLimiter(
+    "orders",
+    RATE_LIMIT_ORDERS_REQUESTS,
+    RATE_LIMIT_ORDERS_WINDOW_SECONDS,
+)
+
+
+async def run_rate_limit_sync() -> None:
+    while True:
+        await asyncio.sleep(RATE_LIMIT_SYNC_INTERVAL_MS / 1000)
+        for limiter in list(_hybrid_limiters):
+            try:
+                await limiter.sync()
+            except RedisError:
+                logger.warning("Rate limit sync failed for %s", limiter.name)
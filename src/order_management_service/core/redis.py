@@ -1,17 +1,361 @@
+import asyncio
+import logging
+import math
+import random
+from contextlib import suppress
+from uuid import uuid4
+
 from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import RedisError
+
+from src.order_management_service.core.local_cache import LocalCache
+from src.order_management_service.core.metrics import (
+    CallbackMetric,
+    dependency_duration_seconds,
+    ratio,
+)
+from src.order_management_service.core.settings import (
+    ORDER_CACHE_INVALIDATION_CHANNEL,
+    ORDER_CACHE_LOCK_TTL_MS,
+    ORDER_CACHE_TTL_SECONDS,
+    ORDER_CACHE_WRITE_BATCH_SIZE,
+    ORDER_CACHE_WRITE_DELAY_MS,
+    ORDER_CACHE_XFETCH_BETA,
+    ORDER_L1_CACHE_SIZE,
+    ORDER_L1_CACHE_TTL_SECONDS,
+    REDIS_URL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> list:
+        with dependency_duration_seconds.time("redis", "pipeline"):
+            return await super().execute(raise_on_error)
+
+
+class InstrumentedRedis(Redis):
+    async def execute_command(self, *args, **options):
+        with dependency_duration_seconds.time("redis", str(args[0]).lower()):
+            return await super().execute_command(*args, **options)
+
+    def pipeline(
+        self,
+        transaction: bool = True,
+        shard_hint: str | None = None,
+    ) -> InstrumentedPipeline:
+        return InstrumentedPipeline(
+            self.connection_pool,
+            self.response_callbacks,
+            transaction,
+            shard_hint,
+        )
+
+
+redis_client = InstrumentedRedis.from_url(REDIS_URL, decode_responses=True)
+
+order_local_cache: LocalCache[str] = LocalCache(
+    maxsize=ORDER_L1_CACHE_SIZE,
+    ttl_seconds=ORDER_L1_CACHE_TTL_SECONDS,
+)
+_redis_cache_stats = {"hits": 0, "misses": 0, "early_refreshes": 0}
+_order_recompute_seconds = 0.01
+_WORKER_ID = uuid4().hex
+
+_release_lock_script = redis_client.register_script(
+    """
+    if redis.call("GET", KEYS[1]) == ARGV[1] then
+        return redis.call("DEL", KEYS[1])
+    end
+    return 0
+    """
+)
+
 
-from src.order_management_service.core.settings import REDIS_URL
+def should_refresh_early(
+    ttl_seconds: float,
+    recompute_seconds: float,
+    beta: float = ORDER_CACHE_XFETCH_BETA,
+) -> bool:
+    # XFetch: the closer the key is to expiry, the likelier one reader
+    # recomputes it ahead of time instead of everyone missing at once.
+    return recompute_seconds * beta * -math.log(1.0 - random.random()) >= ttl_seconds
 
-redis_client = Redis.from_url(REDIS_URL, decode_responses=True)
+
+def record_order_recompute(seconds: float) -> None:
+    global _order_recompute_seconds
+    _order_recompute_seconds = 0.8 * _order_recompute_seconds + 0.2 * seconds
 
 
 async def get_order_from_cache(order_id: str) -> str | None:
+    key = f"order:{order_id}"
+    cached = order_local_cache.get(key)
+    if cached is not None:
+        return cached
+
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.get(key)
+        pipe.pttl(key)
+        cached, ttl_ms = await pipe.execute()
+    if cached is None:
+        _redis_cache_stats["misses"] += 1
+        return None
+
+    if ttl_ms > 0 and should_refresh_early(ttl_ms / 1000, _order_recompute_seconds):
+        _redis_cache_stats["early_refreshes"] += 1
+        return None
+
+    _redis_cache_stats["hits"] += 1
+    order_local_cache.set(key, cached, ttl_ms / 1000 if ttl_ms > 0 else None)
+    return cached
+
+
+async def get_orders_from_cache(order_ids: list[str]) -> dict[str, str]:
+    found: dict[str, str] = {}
+    remote: list[str] = []
+    for order_id in order_ids:
+        cached = order_local_cache.get(f"order:{order_id}")
+        if cached is not None:
+            found[order_id] = cached
+        else:
+            remote.append(order_id)
+    if not remote:
+        return found
+
+    values = await redis_client.mget([f"order:{order_id}" for order_id in remote])
+    for order_id, cached in zip(remote, values):
+        if cached is None:
+            _redis_cache_stats["misses"] += 1
+            continue
+        _redis_cache_stats["hits"] += 1
+        found[order_id] = cached
+        order_local_cache.set(f"order:{order_id}", cached)
+    return found
+
+
+async def peek_order_in_cache(order_id: str) -> str | None:
     return await redis_client.get(f"order:{order_id}")
 
 
-async def set_order_to_cache(order_id: str, data: str, ttl_seconds: int = 300) -> None:
-    await redis_client.setex(f"order:{order_id}", ttl_seconds, data)
+async def acquire_order_lock(order_id: str) -> str | None:
+    token = uuid4().hex
+    acquired = await redis_client.set(
+        f"lock:order:{order_id}",
+        token,
+        nx=True,
+        px=ORDER_CACHE_LOCK_TTL_MS,
+    )
+    return token if acquired else None
+
+
+async def release_order_lock(order_id: str, token: str) -> None:
+    await _release_lock_script(keys=[f"lock:order:{order_id}"], args=[token])
+
+
+class OrderCacheWriter:
+    def __init__(
+        self,
+        max_batch_size: int = ORDER_CACHE_WRITE_BATCH_SIZE,
+        max_delay_ms: float = ORDER_CACHE_WRITE_DELAY_MS,
+    ):
+        self.max_batch_size = max_batch_size
+        self.max_delay_ms = max_delay_ms
+        # key -> (value or None for a delete, ttl, publish an invalidation,
+        # only set a missing key); a later write to the same key replaces the
+        # pending one, unless it is itself only meant for a missing key.
+        self._pending: dict[str, tuple[str | None, int, bool, bool]] = {}
+        self._waiters: list[asyncio.Future[None]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._batch_full: asyncio.Future[None] | None = None
+        self.stats = {"writes": 0, "coalesced": 0, "flushes": 0}
+
+    async def write(
+        self,
+        entries: dict[str, str | None],
+        ttl_seconds: int = ORDER_CACHE_TTL_SECONDS,
+        publish: bool = False,
+        local: bool = True,
+        nx: bool = False,
+    ) -> None:
+        if not entries:
+            return
+        for order_id, data in entries.items():
+            key = f"order:{order_id}"
+            self.stats["writes"] += 1
+            previous = self._pending.get(key)
+            if previous is not None:
+                self.stats["coalesced"] += 1
+                if nx and not previous[3]:
+                    continue
+            if data is None:
+                order_local_cache.delete(key)
+            elif local and not nx:
+                order_local_cache.set(key, data, ttl_seconds)
+            self._pending[key] = (
+                data,
+                ttl_seconds,
+                publish or (previous is not None and previous[2]),
+                nx,
+            )
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        elif (
+            len(self._pending) >= self.max_batch_size
+            and self._batch_full is not None
+            and not self._batch_full.done()
+        ):
+            self._batch_full.set_result(None)
+        # Only this caller's future is awaited: cancelling the caller never
+        # interrupts a flush other writers are waiting on.
+        await future
+
+    async def _flush_loop(self) -> None:
+        # A single task flushes, one batch at a time, so writes reach Redis in
+        # the order they were made.
+        try:
+            while self._pending:
+                if len(self._pending) < self.max_batch_size and self.max_delay_ms > 0:
+                    self._batch_full = asyncio.get_running_loop().create_future()
+                    with suppress(TimeoutError):
+                        await asyncio.wait_for(
+                            self._batch_full, self.max_delay_ms / 1000
+                        )
+                    self._batch_full = None
+                await self._flush()
+        except BaseException:
+            for future in self._waiters:
+                future.cancel()
+            self._pending, self._waiters = {}, []
+            raise
+        finally:
+            self._flush_task = None
+
+    async def _flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        waiters, self._waiters = self._waiters, []
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for key, (data, ttl_seconds, publish, nx) in pending.items():
+                    if data is None:
+                        pipe.delete(key)
+                    elif nx:
+                        pipe.set(key, data, ex=ttl_seconds, nx=True)
+                    else:
+                        pipe.setex(key, ttl_seconds, data)
+                    if publish:
+                        pipe.publish(
+                            ORDER_CACHE_INVALIDATION_CHANNEL, f"{_WORKER_ID}:{key}"
+                        )
+                await pipe.execute()
+            self.stats["flushes"] += 1
+        except Exception as exc:  # noqa: BLE001 - handed to every waiter of the batch
+            for future in waiters:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        except BaseException:
+            for future in waiters:
+                future.cancel()
+            raise
+
+        for future in waiters:
+            if not future.done():
+                future.set_result(None)
+
+
+order_cache_writer = OrderCacheWriter()
+
+
+async def set_order_to_cache(
+    order_id: str,
+    data: str,
+    ttl_seconds: int = ORDER_CACHE_TTL_SECONDS,
+) -> None:
+    await order_cache_writer.write({order_id: data}, ttl_seconds)
+
+
+async def set_orders_to_cache(
+    entries: dict[str, str],
+    ttl_seconds: int = ORDER_CACHE_TTL_SECONDS,
+    local: bool = True,
+    nx: bool = False,
+) -> None:
+    await order_cache_writer.write(entries, ttl_seconds, local=local, nx=nx)
+
+
+async def refresh_orders_cache(
+    entries: dict[str, str],
+    ttl_seconds: int = ORDER_CACHE_TTL_SECONDS,
+) -> None:
+    await order_cache_writer.write(entries, ttl_seconds, publish=True)
 
 
 async def invalidate_order_cache(order_id: str) -> None:
-    await redis_client.delete(f"order:{order_id}")
+    await order_cache_writer.write({order_id: None}, publish=True)
+
+
+async def invalidate_orders_cache(order_ids: list[str]) -> None:
+    await order_cache_writer.write(dict.fromkeys(order_ids), publish=True)
+
+
+def get_order_cache_stats() -> dict:
+    return {
+        "l1": order_local_cache.stats(),
+        "l2": dict(_redis_cache_stats),
+        "writer": dict(order_cache_writer.stats),
+    }
+
+
+def _collect_order_cache_hit_ratio() -> dict[tuple[str, ...], float]:
+    return {
+        ("l1",): ratio(order_local_cache.hits, order_local_cache.misses),
+        ("l2",): ratio(_redis_cache_stats["hits"], _redis_cache_stats["misses"]),
+    }
+
+
+def _collect_order_cache_requests() -> dict[tuple[str, ...], float]:
+    return {
+        ("l1", "hit"): order_local_cache.hits,
+        ("l1", "miss"): order_local_cache.misses,
+        ("l2", "hit"): _redis_cache_stats["hits"],
+        ("l2", "miss"): _redis_cache_stats["misses"],
+        ("l2", "early_refresh"): _redis_cache_stats["early_refreshes"],
+    }
+
+
+CallbackMetric(
+    "order_cache_hit_ratio",
+    "Share of order cache lookups served by each cache level since start.",
+    "gauge",
+    ("level",),
+    _collect_order_cache_hit_ratio,
+)
+CallbackMetric(
+    "order_cache_requests_total",
+    "Order cache lookups by level and result.",
+    "counter",
+    ("level", "result"),
+    _collect_order_cache_requests,
+)
+
+
+async def listen_order_cache_invalidations(retry_delay_seconds: float = 1.0) -> None:
+    while True:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(ORDER_CACHE_INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                origin, _, key = message["data"].partition(":")
+                if origin != _WORKER_ID:
+                    order_local_cache.delete(key)
+        except RedisError:
+            logger.warning("Order cache invalidation channel lost, dropping L1 cache")
+            order_local_cache.clear()
+            await asyncio.sleep(retry_delay_seconds)
+        finally:
+            await pubsub.aclose()
@@ -1,18 +1,61 @@
-from datetime import datetime, timedelta, timezone
+import asyncio
+import hashlib
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from typing import Annotated
+from uuid import uuid4
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from redis.exceptions import RedisError
 
+from src.order_management_service.core.bloom import BloomFilter
+from src.order_management_service.core.database import bind_db_user
+from src.order_management_service.core.local_cache import LocalCache
+from src.order_management_service.core.metrics import (
+    CallbackMetric,
+    dependency_duration_seconds,
+    ratio,
+)
+from src.order_management_service.core.redis import redis_client
 from src.order_management_service.core.settings import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
-    JWT_SECRET_KEY,
     JWT_ALGORITHM,
+    JWT_CACHE_SIZE,
+    JWT_SECRET_KEY,
+    PASSWORD_HASH_EXECUTOR,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_ROUNDS,
+    PASSWORD_HASH_WORKERS,
+    TOKEN_REVOCATION_BLOOM_CAPACITY,
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+    TOKEN_REVOCATION_CHANNEL,
+    TOKEN_REVOCATION_SYNC_SECONDS,
 )
 
+logger = logging.getLogger(__name__)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token/")
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=PASSWORD_HASH_ROUNDS,
+)
+
+_HASH_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+_hash_executor: Executor | None = None
+_hash_stats = {
+    "pending": 0,
+    "completed": 0,
+    "rejected": 0,
+    "latency_seconds_sum": 0.0,
+    "latency_buckets": {str(bucket): 0 for bucket in _HASH_LATENCY_BUCKETS},
+}
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -23,27 +66,177 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        if PASSWORD_HASH_EXECUTOR == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+        else:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+    return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        executor, _hash_executor = _hash_executor, None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run_in_hash_pool(fn, *args):
+    if _hash_stats["pending"] >= PASSWORD_HASH_MAX_PENDING:
+        _hash_stats["rejected"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is temporarily overloaded, retry later",
+            headers={"Retry-After": "1"},
+        )
+
+    _hash_stats["pending"] += 1
+    started = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), fn, *args)
+    finally:
+        elapsed = time.perf_counter() - started
+        _hash_stats["pending"] -= 1
+        _hash_stats["completed"] += 1
+        _hash_stats["latency_seconds_sum"] += elapsed
+        dependency_duration_seconds.observe(elapsed, "password_hash", fn.__name__)
+        for bucket in _HASH_LATENCY_BUCKETS:
+            if elapsed <= bucket:
+                _hash_stats["latency_buckets"][str(bucket)] += 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_pool(get_password_hash, password)
+
+
+def get_password_hash_stats() -> dict:
+    return {
+        **_hash_stats,
+        "latency_buckets": dict(_hash_stats["latency_buckets"]),
+        "max_pending": PASSWORD_HASH_MAX_PENDING,
+        "executor": PASSWORD_HASH_EXECUTOR,
+        "workers": PASSWORD_HASH_WORKERS,
+    }
+
+
+_verified_tokens: LocalCache[dict] = LocalCache(
+    maxsize=JWT_CACHE_SIZE,
+    ttl_seconds=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+CallbackMetric(
+    "jwt_cache_hit_ratio",
+    "Share of bearer tokens served from the verified-token cache since start.",
+    "gauge",
+    (),
+    lambda: {(): ratio(_verified_tokens.hits, _verified_tokens.misses)},
+)
+_revoked_filter = BloomFilter(
+    TOKEN_REVOCATION_BLOOM_CAPACITY,
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+)
+_REVOKED_TOKENS_KEY = "revoked_tokens"
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now(UTC) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode["exp"] = expire
+    to_encode["jti"] = uuid4().hex
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
+async def store_token_revocation(jti: str, expires_at: int) -> None:
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.zadd(_REVOKED_TOKENS_KEY, {jti: expires_at})
+        pipe.zremrangebyscore(_REVOKED_TOKENS_KEY, "-inf", time.time())
+        pipe.publish(TOKEN_REVOCATION_CHANNEL, jti)
+        await pipe.execute()
+
+
+async def is_token_revoked(jti: str) -> bool:
+    return await redis_client.zscore(_REVOKED_TOKENS_KEY, jti) is not None
+
+
+async def revoke_token(payload: dict) -> None:
+    _revoked_filter.add(payload["jti"])
+    await store_token_revocation(payload["jti"], int(payload["exp"]))
+
+
+async def _reload_revoked_tokens() -> None:
+    global _revoked_filter
+    revoked = await redis_client.zrangebyscore(_REVOKED_TOKENS_KEY, time.time(), "+inf")
+    fresh_filter = BloomFilter(
+        TOKEN_REVOCATION_BLOOM_CAPACITY,
+        TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+    )
+    for jti in revoked:
+        fresh_filter.add(jti)
+    _revoked_filter = fresh_filter
+
+
+async def run_token_revocation_sync(retry_delay_seconds: float = 1.0) -> None:
+    while True:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(TOKEN_REVOCATION_CHANNEL)
+            await _reload_revoked_tokens()
+            next_reload = time.monotonic() + TOKEN_REVOCATION_SYNC_SECONDS
+            while True:
+                message = await pubsub.get_message(
+                    timeout=max(next_reload - time.monotonic(), 0.0),
+                )
+                if message is not None:
+                    _revoked_filter.add(message["data"])
+                if time.monotonic() >= next_reload:
+                    await _reload_revoked_tokens()
+                    next_reload = time.monotonic() + TOKEN_REVOCATION_SYNC_SECONDS
+        except RedisError:
+            logger.warning("Token revocation sync lost its Redis connection")
+            await asyncio.sleep(retry_delay_seconds)
+        finally:
+            await pubsub.aclose()
+
+
+async def get_current_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-    except JWTError:
+
+    token_digest = hashlib.sha256(token.encode()).hexdigest()
+    payload = _verified_tokens.get(token_digest)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        except JWTError:
+            raise credentials_exception
+        _verified_tokens.set(token_digest, payload, payload.get("exp", 0) - time.time())
+
+    if not payload.get("sub"):
         raise credentials_exception
 
-    user_id = payload.get("sub")
-    if not user_id:
+    jti = payload.get("jti")
+    if jti and jti in _revoked_filter and await is_token_revoked(jti):
         raise credentials_exception
 
-    return {"id": int(user_id)}
+    return payload
+
+
+async def get_current_user(
+    payload: Annotated[dict, Depends(get_current_token_payload)],
+) -> dict:
+    user_id = int(payload["sub"])
+    await bind_db_user(user_id)
+    return {"id": user_id}
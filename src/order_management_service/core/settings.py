@@ -1,10 +1,29 @@
 import os
 
-
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
     "postgresql+asyncpg://order_user:order_password@db:5432/order_db",
 )
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+SQL_PROFILING_ENABLED = os.getenv("SQL_PROFILING_ENABLED", "false").lower() == "true"
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+SQL_PROFILE_SLOWEST = int(os.getenv("SQL_PROFILE_SLOWEST", "5"))
+SQL_PROFILE_HISTORY = int(os.getenv("SQL_PROFILE_HISTORY", "100"))
+
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL") or None
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+DB_REPLICA_STICKY_USERS = int(os.getenv("DB_REPLICA_STICKY_USERS", "100000"))
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "1"))
+DB_REPLICA_CHECK_INTERVAL_SECONDS = float(
+    os.getenv("DB_REPLICA_CHECK_INTERVAL_SECONDS", "1")
+)
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
@@ -16,6 +35,88 @@ KAFKA_BOOTSTRAP_SERVERS = os.getenv(
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "change_me")
 JWT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+TOKEN_REVOCATION_CHANNEL = os.getenv("TOKEN_REVOCATION_CHANNEL", "token-revocations")
+TOKEN_REVOCATION_SYNC_SECONDS = float(os.getenv("TOKEN_REVOCATION_SYNC_SECONDS", "30"))
+TOKEN_REVOCATION_BLOOM_CAPACITY = int(
+    os.getenv("TOKEN_REVOCATION_BLOOM_CAPACITY", "100000")
+)
+TOKEN_REVOCATION_BLOOM_ERROR_RATE = float(
+    os.getenv("TOKEN_REVOCATION_BLOOM_ERROR_RATE", "0.001")
+)
+
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "29000"))
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))
+)
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
 
 RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "60"))
 RATE_LIMIT_WINDOW_SECONDS = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+RATE_LIMIT_ALGORITHM = os.getenv("RATE_LIMIT_ALGORITHM", "sliding_window")
+RATE_LIMIT_MODE = os.getenv("RATE_LIMIT_MODE", "redis")
+RATE_LIMIT_SYNC_INTERVAL_MS = int(os.getenv("RATE_LIMIT_SYNC_INTERVAL_MS", "100"))
+RATE_LIMIT_HYBRID_TOLERANCE = float(os.getenv("RATE_LIMIT_HYBRID_TOLERANCE", "0.1"))
+RATE_LIMIT_LOGIN_REQUESTS = int(
+    os.getenv("RATE_LIMIT_LOGIN_REQUESTS", str(RATE_LIMIT_REQUESTS))
+)
+RATE_LIMIT_LOGIN_WINDOW_SECONDS = int(
+    os.getenv("RATE_LIMIT_LOGIN_WINDOW_SECONDS", str(RATE_LIMIT_WINDOW_SECONDS))
+)
+RATE_LIMIT_ORDERS_REQUESTS = int(
+    os.getenv("RATE_LIMIT_ORDERS_REQUESTS", str(RATE_LIMIT_REQUESTS))
+)
+RATE_LIMIT_ORDERS_WINDOW_SECONDS = int(
+    os.getenv("RATE_LIMIT_ORDERS_WINDOW_SECONDS", str(RATE_LIMIT_WINDOW_SECONDS))
+)
+
+KAFKA_LINGER_MS = int(os.getenv("KAFKA_LINGER_MS", "5"))
+KAFKA_MAX_BATCH_SIZE = int(os.getenv("KAFKA_MAX_BATCH_SIZE", "65536"))
+KAFKA_COMPRESSION_TYPE = os.getenv("KAFKA_COMPRESSION_TYPE") or None
+KAFKA_ACKS = os.getenv("KAFKA_ACKS", "all")
+KAFKA_SEND_WAIT = os.getenv("KAFKA_SEND_WAIT", "false").lower() == "true"
+
+OUTBOX_RELAY_IN_APP = os.getenv("OUTBOX_RELAY_IN_APP", "true").lower() == "true"
+OUTBOX_RELAY_BATCH_SIZE = int(os.getenv("OUTBOX_RELAY_BATCH_SIZE", "500"))
+OUTBOX_RELAY_POLL_INTERVAL_SECONDS = float(
+    os.getenv("OUTBOX_RELAY_POLL_INTERVAL_SECONDS", "0.5")
+)
+
+ORDER_ID_VERSION = int(os.getenv("ORDER_ID_VERSION", "7"))
+
+ORDERS_PAGE_DEFAULT_LIMIT = int(os.getenv("ORDERS_PAGE_DEFAULT_LIMIT", "50"))
+ORDERS_PAGE_MAX_LIMIT = int(os.getenv("ORDERS_PAGE_MAX_LIMIT", "500"))
+ORDERS_CURSOR_BY_ID = os.getenv("ORDERS_CURSOR_BY_ID", "false").lower() == "true"
+ORDERS_STREAM_YIELD_PER = int(os.getenv("ORDERS_STREAM_YIELD_PER", "500"))
+
+ORDERS_BULK_MAX_SIZE = int(os.getenv("ORDERS_BULK_MAX_SIZE", "500"))
+ORDERS_BATCH_GET_MAX_SIZE = int(os.getenv("ORDERS_BATCH_GET_MAX_SIZE", "200"))
+ORDERS_STATUS_BATCH_MAX_SIZE = int(os.getenv("ORDERS_STATUS_BATCH_MAX_SIZE", "5000"))
+
+ORDER_CACHE_TTL_SECONDS = int(os.getenv("ORDER_CACHE_TTL_SECONDS", "300"))
+ORDER_L1_CACHE_SIZE = int(os.getenv("ORDER_L1_CACHE_SIZE", "10000"))
+ORDER_L1_CACHE_TTL_SECONDS = float(os.getenv("ORDER_L1_CACHE_TTL_SECONDS", "5"))
+ORDER_CACHE_INVALIDATION_CHANNEL = os.getenv(
+    "ORDER_CACHE_INVALIDATION_CHANNEL",
+    "order-cache-invalidations",
+)
+
+ORDER_CACHE_XFETCH_BETA = float(os.getenv("ORDER_CACHE_XFETCH_BETA", "1.0"))
+ORDER_CACHE_LOCK_TTL_MS = int(os.getenv("ORDER_CACHE_LOCK_TTL_MS", "2000"))
+ORDER_CACHE_LOCK_WAIT_MS = int(os.getenv("ORDER_CACHE_LOCK_WAIT_MS", "500"))
+ORDER_CACHE_LOCK_POLL_MS = int(os.getenv("ORDER_CACHE_LOCK_POLL_MS", "25"))
+ORDER_CACHE_WRITE_BATCH_SIZE = int(os.getenv("ORDER_CACHE_WRITE_BATCH_SIZE", "500"))
+ORDER_CACHE_WRITE_DELAY_MS = float(os.getenv("ORDER_CACHE_WRITE_DELAY_MS", "2"))
+ORDER_CACHE_POPULATE = os.getenv("ORDER_CACHE_POPULATE", "write")
+
+CONSUMER_GROUP_ID = os.getenv("CONSUMER_GROUP_ID", "order-processors")
+CONSUMER_BATCH_SIZE = int(os.getenv("CONSUMER_BATCH_SIZE", "500"))
+CONSUMER_MAX_IN_FLIGHT = int(os.getenv("CONSUMER_MAX_IN_FLIGHT", "50"))
+CONSUMER_POLL_TIMEOUT_MS = int(os.getenv("CONSUMER_POLL_TIMEOUT_MS", "1000"))
+CONSUMER_METRICS_PORT = int(os.getenv("CONSUMER_METRICS_PORT", "9101"))
+CONSUMER_RETRY_BACKOFF_MS = int(os.getenv("CONSUMER_RETRY_BACKOFF_MS", "500"))
+CONSUMER_RETRY_BACKOFF_MAX_MS = int(os.getenv("CONSUMER_RETRY_BACKOFF_MAX_MS", "30000"))
+
+ORDER_PROCESSING_BATCH_SIZE = int(os.getenv("ORDER_PROCESSING_BATCH_SIZE", "1000"))
+ORDER_PROCESSING_MAX_DELAY_MS = int(os.getenv("ORDER_PROCESSING_MAX_DELAY_MS", "20"))
@@ -0,0 +1,34 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+
+class SingleFlight[T]:
+    def __init__(self) -> None:
+        self._in_flight: dict[str, asyncio.Future[T]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        while (in_flight := self._in_flight.get(key)) is not None:
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # A cancelled leader must not cancel its waiters: unless this
+                # task was cancelled itself, run the call again.
+                if not in_flight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
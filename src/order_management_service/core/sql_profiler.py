@@ -0,0 +1,121 @@
+import heapq
+import logging
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from src.order_management_service.core.settings import (
+    SQL_N_PLUS_ONE_THRESHOLD,
+    SQL_PROFILE_HISTORY,
+    SQL_PROFILE_SLOWEST,
+    SQL_PROFILING_ENABLED,
+    SQL_SLOW_QUERY_MS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryProfile:
+    count: int = 0
+    total_seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        self.statements[statement] += 1
+        if len(self.slowest) < SQL_PROFILE_SLOWEST:
+            heapq.heappush(self.slowest, (elapsed, statement))
+        elif elapsed > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (elapsed, statement))
+
+    def n_plus_one_candidates(self) -> list[dict]:
+        return [
+            {"statement": statement, "count": count}
+            for statement, count in self.statements.most_common()
+            if count >= SQL_N_PLUS_ONE_THRESHOLD
+        ]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "slowest": [
+                {"statement": statement, "ms": round(elapsed * 1000, 3)}
+                for elapsed, statement in sorted(self.slowest, reverse=True)
+            ],
+            "n_plus_one": self.n_plus_one_candidates(),
+        }
+
+
+_current_profile: ContextVar[QueryProfile | None] = ContextVar(
+    "sql_query_profile",
+    default=None,
+)
+_recent_profiles: deque[dict] = deque(maxlen=SQL_PROFILE_HISTORY)
+
+
+def record_statement(statement: str, elapsed: float) -> None:
+    if elapsed * 1000 >= SQL_SLOW_QUERY_MS > 0:
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, statement)
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+
+
+def get_recent_profiles() -> list[dict]:
+    return list(_recent_profiles)
+
+
+class SqlProfilingMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not SQL_PROFILING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current_profile.set(profile)
+
+        async def send_with_profile(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(profile.count).encode()))
+                headers.append(
+                    (
+                        b"x-db-query-time-ms",
+                        f"{profile.total_seconds * 1000:.3f}".encode(),
+                    )
+                )
+                if profile.n_plus_one_candidates():
+                    headers.append((b"x-db-n-plus-one", b"1"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _current_profile.reset(token)
+            summary = profile.summary()
+            for candidate in summary["n_plus_one"]:
+                logger.warning(
+                    "Possible N+1 in %s %s: %d x %s",
+                    scope["method"],
+                    scope["path"],
+                    candidate["count"],
+                    candidate["statement"],
+                )
+            _recent_profiles.append(
+                {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                    **summary,
+                }
+            )
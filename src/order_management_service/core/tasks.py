@@ -1,15 +1,33 @@
-import asyncio
+from uuid import UUID
 
-from taskiq import TaskiqScheduler
+from taskiq import TaskiqEvents, TaskiqScheduler, TaskiqState
 from taskiq_redis import RedisStreamBroker
 
+from src.order_management_service.core.database import async_session_maker
 from src.order_management_service.core.settings import REDIS_URL
+from src.order_management_service.models.order import (
+    ORDER_STATUS_TRANSITIONS,
+    OrderStatus,
+)
+from src.order_management_service.services.order_processor import OrderStatusBatcher
 
 broker = RedisStreamBroker(url=REDIS_URL)
-scheduler = TaskiqScheduler(broker)
+scheduler = TaskiqScheduler(broker, sources=[])
+
+order_status_batcher = OrderStatusBatcher(async_session_maker)
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def flush_order_statuses(_state: TaskiqState) -> None:
+    await order_status_batcher.flush()
 
 
 @broker.task
-async def process_order_task(order_id: str) -> None:
-    await asyncio.sleep(2)
-    print(f"Order {order_id} processed")
+async def process_order_task(
+    order_id: str,
+    status: str = OrderStatus.PAID.value,
+) -> bool:
+    target = OrderStatus(status)
+    if target not in ORDER_STATUS_TRANSITIONS:
+        raise ValueError(f"Orders cannot be moved to {target.value}")
+    return await order_status_batcher.submit(UUID(order_id), target)
@@ -1,14 +1,75 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
 
 from src.order_management_service.api.auth import auth_router
+from src.order_management_service.api.internal import internal_router
 from src.order_management_service.api.orders import orders_router
+from src.order_management_service.core.database import (
+    replica_engine,
+    run_replica_health_check,
+)
+from src.order_management_service.core.kafka import (
+    start_kafka_producer,
+    stop_kafka_producer,
+)
+from src.order_management_service.core.metrics import (
+    CONTENT_TYPE,
+    MetricsMiddleware,
+    render_metrics,
+)
+from src.order_management_service.core.rate_limiter import run_rate_limit_sync
+from src.order_management_service.core.redis import listen_order_cache_invalidations
+from src.order_management_service.core.security import (
+    run_token_revocation_sync,
+    shutdown_hash_executor,
+)
+from src.order_management_service.core.settings import (
+    OUTBOX_RELAY_IN_APP,
+    RATE_LIMIT_MODE,
+)
+from src.order_management_service.core.sql_profiler import SqlProfilingMiddleware
+from src.order_management_service.services.outbox_relay import run_outbox_relay
+
+
+async def _cancel_tasks(tasks: list[asyncio.Task]) -> None:
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    await start_kafka_producer()
+    background_tasks = [
+        asyncio.create_task(listen_order_cache_invalidations()),
+        asyncio.create_task(run_token_revocation_sync()),
+    ]
+    if OUTBOX_RELAY_IN_APP:
+        background_tasks.append(asyncio.create_task(run_outbox_relay()))
+    if RATE_LIMIT_MODE == "hybrid":
+        background_tasks.append(asyncio.create_task(run_rate_limit_sync()))
+    if replica_engine is not None:
+        background_tasks.append(asyncio.create_task(run_replica_health_check()))
+    try:
+        yield
+    finally:
+        await _cancel_tasks(background_tasks)
+        await stop_kafka_producer()
+        shutdown_hash_executor()
+
 
 app = FastAPI(
     title="Order Management Service",
     description="Сервис управления заказами",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -18,9 +79,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(SqlProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth_router)
 app.include_router(orders_router)
+app.include_router(internal_router)
 
 
 @app.get("/", include_in_schema=False)
@@ -35,3 +99,13 @@ async def root() -> RedirectResponse:
 )
 async def health_check() -> dict:
     return {"status": "healthy"}
+
+
+@app.get(
+    "/metrics",
+    summary="Метрики в формате Prometheus",
+    tags=["system"],
+    response_class=PlainTextResponse,
+)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
@@ -1,12 +1,21 @@
-from datetime import datetime
 import enum
+from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, JSON
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
-from uuid import uuid4
 
 from src.order_management_service.core.database import Base
+from src.order_management_service.core.ids import new_order_id
 
 
 class OrderStatus(str, enum.Enum):
@@ -16,14 +25,49 @@ class OrderStatus(str, enum.Enum):
     CANCELED = "CANCELED"
 
 
+ORDER_STATUS_TRANSITIONS: dict[OrderStatus, tuple[OrderStatus, ...]] = {
+    OrderStatus.PAID: (OrderStatus.PENDING,),
+    OrderStatus.SHIPPED: (OrderStatus.PAID,),
+    OrderStatus.CANCELED: (OrderStatus.PENDING, OrderStatus.PAID),
+}
+
+
+ACTIVE_ORDER_STATUSES: tuple[OrderStatus, ...] = (
+    OrderStatus.PENDING,
+    OrderStatus.PAID,
+)
+
+
 class Order(Base):
     __tablename__ = "orders"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    items = Column(JSON, nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=new_order_id)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    items = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
     total_price = Column(Float, nullable=False)
     status = Column(Enum(OrderStatus), default=OrderStatus.PENDING, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     user = relationship("User", backref="orders")
+
+    __table_args__ = (
+        Index(
+            "ix_orders_user_id_created_at",
+            user_id,
+            created_at.desc(),
+            id.desc(),
+        ),
+        Index(
+            "ix_orders_active_status",
+            status,
+            created_at,
+            postgresql_where=status.in_(ACTIVE_ORDER_STATUSES),
+            sqlite_where=status.in_(ACTIVE_ORDER_STATUSES),
+        ),
+        Index(
+            "ix_orders_items",
+            items,
+            postgresql_using="gin",
+            postgresql_ops={"items": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
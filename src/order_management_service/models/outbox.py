@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.order_management_service.core.database import Base
+
+
+class OrderOutbox(Base):
+    __tablename__ = "order_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"), nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
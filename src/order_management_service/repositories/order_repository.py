@@ -1,9 +1,42 @@
+from collections.abc import AsyncIterator
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import Select, select, update
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Uuid,
+    case,
+    column,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    type_coerce,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.order_management_service.core.settings import ORDERS_STREAM_YIELD_PER
 from src.order_management_service.models.order import Order, OrderStatus
+from src.order_management_service.models.outbox import OrderOutbox
+
+
+def _new_order_event(order: Order) -> dict:
+    return {
+        "order_id": order.id,
+        "payload": {
+            "order_id": str(order.id),
+            "user_id": order.user_id,
+            "total_price": order.total_price,
+            "status": order.status.value,
+            "items": order.items,
+        },
+    }
 
 
 class OrderRepository:
@@ -22,15 +55,41 @@ class OrderRepository:
             total_price=total_price,
         )
         self.db.add(order)
+        await self.db.flush()
+        self.db.add(OrderOutbox(**_new_order_event(order)))
         await self.db.commit()
         await self.db.refresh(order)
         return order
 
+    async def create_orders(
+        self,
+        user_id: int,
+        orders: list[tuple[list[dict], float]],
+    ) -> list[Order]:
+        result = await self.db.scalars(
+            insert(Order).returning(Order, sort_by_parameter_order=True),
+            [
+                {"user_id": user_id, "items": items, "total_price": total_price}
+                for items, total_price in orders
+            ],
+        )
+        created = list(result.all())
+        await self.db.execute(
+            insert(OrderOutbox),
+            [_new_order_event(order) for order in created],
+        )
+        await self.db.commit()
+        return created
+
     async def get_by_id(self, order_id: UUID) -> Order | None:
         query: Select[tuple[Order]] = select(Order).where(Order.id == order_id)
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_by_ids(self, order_ids: list[UUID]) -> list[Order]:
+        result = await self.db.execute(select(Order).where(Order.id.in_(order_ids)))
+        return list(result.scalars().all())
+
     async def update_status(
         self,
         order_id: UUID,
@@ -46,7 +105,125 @@ class OrderRepository:
         await self.db.commit()
         return result.scalar_one_or_none()
 
-    async def get_by_user_id(self, user_id: int) -> list[Order]:
-        query: Select[tuple[Order]] = select(Order).where(Order.user_id == user_id)
+    async def update_statuses(self, changes: dict[UUID, OrderStatus]) -> list[Order]:
+        if self.db.get_bind().dialect.name == "postgresql":
+            changed = values(
+                column("id", Uuid()),
+                column("status", Order.status.type),
+                name="changed",
+            ).data(list(changes.items()))
+            query = (
+                update(Order)
+                .where(Order.id == changed.c.id)
+                .values(status=changed.c.status)
+            )
+        else:
+            query = (
+                update(Order)
+                .where(Order.id.in_(list(changes)))
+                .values(
+                    status=case(
+                        {
+                            order_id: literal(status, Order.status.type)
+                            for order_id, status in changes.items()
+                        },
+                        value=Order.id,
+                    )
+                )
+            )
+        result = await self.db.execute(
+            query.returning(Order),
+            execution_options={"synchronize_session": False},
+        )
+        await self.db.commit()
+        return list(result.scalars().all())
+
+    @staticmethod
+    def _user_orders_query(user_id: int) -> Select[tuple[Order]]:
+        return (
+            select(Order)
+            .where(Order.user_id == user_id)
+            .order_by(Order.created_at.desc(), Order.id.desc())
+        )
+
+    async def transition_statuses(
+        self,
+        order_ids: list[UUID],
+        status: OrderStatus,
+        from_statuses: tuple[OrderStatus, ...],
+    ) -> list[UUID]:
+        query = (
+            update(Order)
+            .where(Order.id.in_(order_ids), Order.status.in_(from_statuses))
+            .values(status=status)
+            .returning(Order.id)
+        )
+        result = await self.db.execute(query)
+        await self.db.commit()
+        return list(result.scalars().all())
+
+    @staticmethod
+    def _after(
+        query: Select[tuple[Order]],
+        after: tuple[datetime, UUID] | UUID | None,
+    ) -> Select[tuple[Order]]:
+        if isinstance(after, UUID):
+            anchor = select(Order.created_at).where(Order.id == after).scalar_subquery()
+            return query.where(
+                tuple_(Order.created_at, Order.id) < tuple_(anchor, after)
+            )
+        if after is not None:
+            return query.where(tuple_(Order.created_at, Order.id) < after)
+        return query
+
+    def _contains_product(self, product_id: int) -> ColumnElement[bool]:
+        if self.db.get_bind().dialect.name == "postgresql":
+            return type_coerce(Order.items, JSONB).contains(
+                [{"product_id": product_id}]
+            )
+        item = func.json_each(Order.items).table_valued("value")
+        return exists(
+            select(1)
+            .select_from(item)
+            .where(func.json_extract(item.c.value, "$.product_id") == product_id)
+        )
+
+    async def get_by_user_id(
+        self,
+        user_id: int,
+        limit: int,
+        after: tuple[datetime, UUID] | UUID | None = None,
+    ) -> list[Order]:
+        query = self._after(self._user_orders_query(user_id), after).limit(limit)
         result = await self.db.execute(query)
         return list(result.scalars().all())
+
+    async def search(
+        self,
+        user_id: int,
+        limit: int,
+        after: tuple[datetime, UUID] | UUID | None = None,
+        product_id: int | None = None,
+        status: OrderStatus | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[Order]:
+        query = self._after(self._user_orders_query(user_id), after).limit(limit)
+        if product_id is not None:
+            query = query.where(self._contains_product(product_id))
+        if status is not None:
+            query = query.where(Order.status == status)
+        if created_from is not None:
+            query = query.where(Order.created_at >= created_from)
+        if created_to is not None:
+            query = query.where(Order.created_at < created_to)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def stream_by_user_id(self, user_id: int) -> AsyncIterator[Order]:
+        query = self._user_orders_query(user_id).execution_options(
+            yield_per=ORDERS_STREAM_YIELD_PER,
+        )
+        result = await self.db.stream_scalars(query)
+        async for order in result:
+            yield order
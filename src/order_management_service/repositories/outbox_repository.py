@@ -0,0 +1,22 @@
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.order_management_service.models.outbox import OrderOutbox
+
+
+class OutboxRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def lock_pending(self, limit: int) -> list[OrderOutbox]:
+        query = (
+            select(OrderOutbox)
+            .order_by(OrderOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def delete(self, event_ids: list[int]) -> None:
+        await self.db.execute(delete(OrderOutbox).where(OrderOutbox.id.in_(event_ids)))
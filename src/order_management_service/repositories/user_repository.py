@@ -1,6 +1,7 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.order_management_service.core.database import replica_reads_enabled
 from src.order_management_service.models.user import User
 
 
@@ -11,7 +12,11 @@ class UserRepository:
     async def get_by_email(self, email: str) -> User | None:
         query = select(User).where(User.email == email)
         result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        if user is None and replica_reads_enabled():
+            result = await self.db.execute(query.execution_options(use_primary=True))
+            user = result.scalar_one_or_none()
+        return user
 
     async def get_by_id(self, user_id: int) -> User | None:
         query = select(User).where(User.id == user_id)
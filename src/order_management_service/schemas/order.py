@@ -1,8 +1,20 @@
-from datetime import datetime
+from datetime import UTC, datetime
+from typing import Annotated, Any
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    Field,
+    PlainValidator,
+    ValidationError,
+)
 
+from src.order_management_service.core.settings import (
+    ORDERS_BATCH_GET_MAX_SIZE,
+    ORDERS_BULK_MAX_SIZE,
+    ORDERS_STATUS_BATCH_MAX_SIZE,
+)
 from src.order_management_service.models.order import OrderStatus
 
 
@@ -21,6 +33,18 @@ class OrderUpdateStatus(BaseModel):
     status: OrderStatus
 
 
+class OrderStatusChange(BaseModel):
+    id: UUID
+    status: OrderStatus
+
+
+class OrderStatusBatchUpdate(BaseModel):
+    updates: list[OrderStatusChange] = Field(
+        min_length=1,
+        max_length=ORDERS_STATUS_BATCH_MAX_SIZE,
+    )
+
+
 class OrderResponse(BaseModel):
     id: UUID
     user_id: int
@@ -32,3 +56,63 @@ class OrderResponse(BaseModel):
     model_config = {
         "from_attributes": True,
     }
+
+
+class OrderPage(BaseModel):
+    items: list[OrderResponse]
+    next_cursor: str | None = None
+
+
+class InvalidOrderCreate(BaseModel):
+    errors: list[dict[str, Any]]
+
+
+def _validate_bulk_order(value: Any) -> OrderCreate | InvalidOrderCreate:
+    # An invalid order is kept as its errors instead of failing the whole
+    # request, so the rest of the batch can still be created.
+    try:
+        return OrderCreate.model_validate(value)
+    except ValidationError as exc:
+        return InvalidOrderCreate(
+            errors=exc.errors(include_url=False, include_context=False)
+        )
+
+
+BulkOrderCreate = Annotated[
+    OrderCreate | InvalidOrderCreate,
+    PlainValidator(_validate_bulk_order, json_schema_input_type=OrderCreate),
+]
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    # created_at is stored as naive UTC, so aware bounds are converted
+    # rather than compared against it as they are.
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+UtcDatetime = Annotated[datetime, AfterValidator(_to_naive_utc)]
+
+
+class OrderBulkCreate(BaseModel):
+    orders: list[BulkOrderCreate] = Field(min_length=1, max_length=ORDERS_BULK_MAX_SIZE)
+
+
+class OrderBulkItemResult(BaseModel):
+    index: int
+    order: OrderResponse | None = None
+    errors: list[dict[str, Any]] | None = None
+
+
+class OrderBulkResponse(BaseModel):
+    results: list[OrderBulkItemResult]
+
+
+class OrderBatchGet(BaseModel):
+    ids: list[UUID] = Field(min_length=1, max_length=ORDERS_BATCH_GET_MAX_SIZE)
+
+
+class OrderBatchResponse(BaseModel):
+    items: list[OrderResponse]
+    missing: list[UUID]
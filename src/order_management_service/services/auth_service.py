@@ -1,15 +1,15 @@
-from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.order_management_service.models.user import User
-from src.order_management_service.repositories.user_repository import UserRepository
-from src.order_management_service.schemas.user import UserCreate, UserLogin
-from src.order_management_service.schemas.auth import Token
 from src.order_management_service.core.security import (
     create_access_token,
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
 )
+from src.order_management_service.models.user import User
+from src.order_management_service.repositories.user_repository import UserRepository
+from src.order_management_service.schemas.auth import Token
+from src.order_management_service.schemas.user import UserCreate, UserLogin
 
 
 async def register_user(db: AsyncSession, user_data: UserCreate) -> User:
@@ -22,7 +22,7 @@ async def register_user(db: AsyncSession, user_data: UserCreate) -> User:
             detail="User with this email already exists",
         )
 
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     user = await repo.create_user(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -40,7 +40,7 @@ async def authenticate_user(db: AsyncSession, login_data: UserLogin) -> Token:
             detail="Incorrect email or password",
         )
 
-    if not verify_password(login_data.password, user.hashed_password):
+    if not await verify_password_async(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
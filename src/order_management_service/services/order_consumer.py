@@ -1,29 +1,171 @@
 import asyncio
 import json
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from uuid import UUID
 
-from aiokafka import AIOKafkaConsumer
+from aiokafka import (
+    AIOKafkaConsumer,
+    ConsumerRebalanceListener,
+    ConsumerRecord,
+    TopicPartition,
+)
 
-from src.order_management_service.core.settings import KAFKA_BOOTSTRAP_SERVERS
+from src.order_management_service.core.database import async_session_maker
+from src.order_management_service.core.metrics import consumer_lag, serve_metrics
+from src.order_management_service.core.settings import (
+    CONSUMER_BATCH_SIZE,
+    CONSUMER_GROUP_ID,
+    CONSUMER_MAX_IN_FLIGHT,
+    CONSUMER_METRICS_PORT,
+    CONSUMER_POLL_TIMEOUT_MS,
+    CONSUMER_RETRY_BACKOFF_MAX_MS,
+    CONSUMER_RETRY_BACKOFF_MS,
+    KAFKA_BOOTSTRAP_SERVERS,
+    ORDER_CACHE_POPULATE,
+)
 from src.order_management_service.core.tasks import process_order_task
+from src.order_management_service.services.order_service import cache_orders
+
+logger = logging.getLogger(__name__)
+
+
+class DrainingRebalanceListener(ConsumerRebalanceListener):
+    def __init__(self) -> None:
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._idle.set()
+
+    async def on_partitions_revoked(self, revoked: set[TopicPartition]) -> None:
+        await self._idle.wait()
+
+    async def on_partitions_assigned(self, assigned: set[TopicPartition]) -> None:
+        return None
+
+
+async def _enqueue_batch(messages: list[ConsumerRecord], max_in_flight: int) -> None:
+    semaphore = asyncio.Semaphore(max_in_flight)
+    by_key: dict[bytes | None, list[ConsumerRecord]] = defaultdict(list)
+    for message in messages:
+        by_key[message.key].append(message)
+
+    async def enqueue_in_order(key_messages: list[ConsumerRecord]) -> None:
+        for message in key_messages:
+            async with semaphore:
+                await process_order_task.kiq(
+                    order_id=str(message.value.get("order_id"))
+                )
+
+    await asyncio.gather(*(enqueue_in_order(group) for group in by_key.values()))
+
+
+async def _cache_new_orders(messages: list[ConsumerRecord]) -> None:
+    order_ids = []
+    for message in messages:
+        try:
+            order_ids.append(UUID(str(message.value.get("order_id"))))
+        except ValueError:
+            continue
+    if not order_ids:
+        return
+    try:
+        async with async_session_maker() as db:
+            # This process never serves reads, so only Redis is filled, and
+            # only where the key is missing: an entry written by a status
+            # change is newer than this snapshot.
+            await cache_orders(db, order_ids, local=False, nx=True)
+    except Exception:
+        logger.exception("Failed to cache %d new orders", len(order_ids))
+
+
+async def process_next_batch(
+    consumer: AIOKafkaConsumer,
+    listener: DrainingRebalanceListener,
+) -> int:
+    batches: dict[TopicPartition, list[ConsumerRecord]] = await consumer.getmany(
+        timeout_ms=CONSUMER_POLL_TIMEOUT_MS,
+        max_records=CONSUMER_BATCH_SIZE,
+    )
+    messages = [message for records in batches.values() for message in records]
+    if not messages:
+        for partition in consumer.assignment():
+            consumer_lag.set(0, partition.topic, str(partition.partition))
+        return 0
+
+    offsets = {
+        partition: records[-1].offset + 1 for partition, records in batches.items()
+    }
+    async with listener.batch():
+        # Caching before enqueueing keeps this batch's own status tasks from
+        # being overwritten by the snapshot.
+        if ORDER_CACHE_POPULATE == "event":
+            await _cache_new_orders(messages)
+        try:
+            await _enqueue_batch(messages, CONSUMER_MAX_IN_FLIGHT)
+            await consumer.commit(offsets)
+        except Exception:
+            # Each batch starts at the last committed offset, so rewinding to
+            # its first record makes the next poll redeliver the whole batch.
+            for partition, records in batches.items():
+                consumer.seek(partition, records[0].offset)
+            raise
+
+    for partition, offset in offsets.items():
+        highwater = consumer.highwater(partition)
+        if highwater is not None:
+            consumer_lag.set(
+                highwater - offset, partition.topic, str(partition.partition)
+            )
+    return len(messages)
+
+
+async def consume_batches(
+    consumer: AIOKafkaConsumer,
+    listener: DrainingRebalanceListener,
+) -> None:
+    backoff_ms = CONSUMER_RETRY_BACKOFF_MS
+    while True:
+        try:
+            await process_next_batch(consumer, listener)
+        except Exception:
+            logger.exception("Order batch failed, redelivering in %d ms", backoff_ms)
+            await asyncio.sleep(backoff_ms / 1000)
+            backoff_ms = min(backoff_ms * 2, CONSUMER_RETRY_BACKOFF_MAX_MS)
+        else:
+            backoff_ms = CONSUMER_RETRY_BACKOFF_MS
 
 
 async def consume_new_orders() -> None:
     consumer = AIOKafkaConsumer(
-        "new_order",
         bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
+        group_id=CONSUMER_GROUP_ID,
         value_deserializer=lambda v: json.loads(v.decode("utf-8")),
-        enable_auto_commit=True,
+        enable_auto_commit=False,
         auto_offset_reset="earliest",
+        max_poll_records=CONSUMER_BATCH_SIZE,
     )
+    listener = DrainingRebalanceListener()
+    consumer.subscribe(["new_order"], listener=listener)
 
+    metrics_server = None
+    if CONSUMER_METRICS_PORT:
+        metrics_server = await serve_metrics(CONSUMER_METRICS_PORT)
     await consumer.start()
     try:
-        async for message in consumer:
-            payload = message.value
-            order_id = str(payload.get("order_id"))
-            await process_order_task.kiq(order_id=order_id)
+        await consume_batches(consumer, listener)
     finally:
         await consumer.stop()
+        if metrics_server is not None:
+            metrics_server.close()
 
 
 def run_consumer() -> None:
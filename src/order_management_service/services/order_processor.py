@@ -0,0 +1,118 @@
+import asyncio
+from collections import defaultdict
+from contextlib import suppress
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.order_management_service.core.redis import invalidate_orders_cache
+from src.order_management_service.core.settings import (
+    ORDER_PROCESSING_BATCH_SIZE,
+    ORDER_PROCESSING_MAX_DELAY_MS,
+)
+from src.order_management_service.models.order import (
+    ORDER_STATUS_TRANSITIONS,
+    OrderStatus,
+)
+from src.order_management_service.repositories.order_repository import OrderRepository
+
+
+class OrderStatusBatcher:
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        max_batch_size: int = ORDER_PROCESSING_BATCH_SIZE,
+        max_delay_ms: int = ORDER_PROCESSING_MAX_DELAY_MS,
+    ):
+        self.session_maker = session_maker
+        self.max_batch_size = max_batch_size
+        self.max_delay_ms = max_delay_ms
+        self._pending: dict[OrderStatus, list[tuple[UUID, asyncio.Future[bool]]]] = (
+            defaultdict(list)
+        )
+        self._pending_count = 0
+        self._flush_task: asyncio.Task | None = None
+        self._batch_full: asyncio.Future[None] | None = None
+
+    async def submit(self, order_id: UUID, status: OrderStatus) -> bool:
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._pending[status].append((order_id, future))
+        self._pending_count += 1
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        elif (
+            self._pending_count >= self.max_batch_size
+            and self._batch_full is not None
+            and not self._batch_full.done()
+        ):
+            self._batch_full.set_result(None)
+        # Only this caller's future is awaited: cancelling the caller never
+        # interrupts a flush other submitters are waiting on.
+        return await future
+
+    async def flush(self) -> None:
+        while self._flush_task is not None:
+            if self._batch_full is not None and not self._batch_full.done():
+                self._batch_full.set_result(None)
+            await asyncio.shield(self._flush_task)
+
+    async def _flush_loop(self) -> None:
+        # A single task flushes, one batch at a time, so transitions are
+        # committed in the order they were submitted.
+        try:
+            while self._pending_count:
+                if self._pending_count < self.max_batch_size and self.max_delay_ms > 0:
+                    self._batch_full = asyncio.get_running_loop().create_future()
+                    with suppress(TimeoutError):
+                        await asyncio.wait_for(
+                            self._batch_full, self.max_delay_ms / 1000
+                        )
+                    self._batch_full = None
+                await self._flush()
+        except BaseException:
+            for entries in self._pending.values():
+                for _, future in entries:
+                    future.cancel()
+            self._pending, self._pending_count = defaultdict(list), 0
+            raise
+        finally:
+            self._flush_task = None
+
+    async def _flush(self) -> None:
+        batches, self._pending = self._pending, defaultdict(list)
+        self._pending_count = 0
+
+        try:
+            updated: dict[OrderStatus, set[UUID]] = {}
+            async with self.session_maker() as db:
+                repo = OrderRepository(db)
+                for status, entries in batches.items():
+                    updated[status] = set(
+                        await repo.transition_statuses(
+                            [order_id for order_id, _ in entries],
+                            status,
+                            ORDER_STATUS_TRANSITIONS[status],
+                        )
+                    )
+            changed = set().union(*updated.values())
+            if changed:
+                await invalidate_orders_cache([str(order_id) for order_id in changed])
+        except Exception as exc:  # noqa: BLE001 - handed to every waiter of the batch
+            for entries in batches.values():
+                for _, future in entries:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+        except BaseException:
+            # The flush task was cancelled mid-flush (worker shutdown): cancel
+            # the waiters rather than leaving them blocked forever.
+            for entries in batches.values():
+                for _, future in entries:
+                    future.cancel()
+            raise
+
+        for status, entries in batches.items():
+            for order_id, future in entries:
+                if not future.done():
+                    future.set_result(order_id in updated[status])
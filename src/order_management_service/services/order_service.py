@@ -1,24 +1,84 @@
-import json
+import asyncio
+import base64
+import binascii
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import NamedTuple
 from uuid import UUID
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.order_management_service.core.kafka import send_new_order_event
 from src.order_management_service.core.redis import (
+    acquire_order_lock,
     get_order_from_cache,
+    get_orders_from_cache,
+    peek_order_in_cache,
+    record_order_recompute,
+    refresh_orders_cache,
+    release_order_lock,
     set_order_to_cache,
-    invalidate_order_cache,
+    set_orders_to_cache,
 )
-from src.order_management_service.models.order import Order
+from src.order_management_service.core.settings import (
+    ORDER_CACHE_LOCK_POLL_MS,
+    ORDER_CACHE_LOCK_WAIT_MS,
+    ORDER_CACHE_POPULATE,
+    ORDERS_CURSOR_BY_ID,
+)
+from src.order_management_service.core.singleflight import SingleFlight
+from src.order_management_service.models.order import Order, OrderStatus
 from src.order_management_service.repositories.order_repository import OrderRepository
 from src.order_management_service.schemas.order import (
+    InvalidOrderCreate,
+    OrderBatchResponse,
+    OrderBulkItemResult,
+    OrderBulkResponse,
     OrderCreate,
+    OrderPage,
     OrderResponse,
+    OrderStatusChange,
     OrderUpdateStatus,
 )
 
 
+class CachedOrder(NamedTuple):
+    user_id: int
+    body: str
+
+
+def _to_cache_entry(response: OrderResponse) -> str:
+    return f"{response.user_id}\n{response.model_dump_json()}"
+
+
+def _from_cache_entry(cached: str) -> CachedOrder | None:
+    user_id, separator, body = cached.partition("\n")
+    if not separator:
+        return None
+    return CachedOrder(int(user_id), body)
+
+
+def _encode_cursor(order: Order) -> str:
+    if ORDERS_CURSOR_BY_ID:
+        return str(order.id)
+    raw = f"{order.created_at.isoformat()}|{order.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID] | UUID:
+    try:
+        if len(cursor) == 36:
+            return UUID(cursor)
+        created_at, order_id = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(order_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
 async def create_order(
     db: AsyncSession,
     user_id: int,
@@ -35,43 +95,148 @@ async def create_order(
         total_price=total_price,
     )
 
-    await send_new_order_event(
-        order_id=str(order.id),
+    if ORDER_CACHE_POPULATE == "write":
+        response = OrderResponse.model_validate(order)
+        await set_order_to_cache(str(order.id), _to_cache_entry(response))
+
+    return order
+
+
+async def create_orders(
+    db: AsyncSession,
+    user_id: int,
+    orders: list[OrderCreate | InvalidOrderCreate],
+) -> OrderBulkResponse:
+    results: list[OrderBulkItemResult] = []
+    valid: list[tuple[OrderBulkItemResult, OrderCreate]] = []
+    for index, order_data in enumerate(orders):
+        result = OrderBulkItemResult(index=index)
+        results.append(result)
+        if isinstance(order_data, InvalidOrderCreate):
+            result.errors = order_data.errors
+        else:
+            valid.append((result, order_data))
+
+    if not valid:
+        return OrderBulkResponse(results=results)
+
+    repo = OrderRepository(db)
+    created = await repo.create_orders(
         user_id=user_id,
-        total_price=order.total_price,
-        status=order.status.value,
-        items=items_payload,
+        orders=[
+            ([item.model_dump() for item in order_data.items], order_data.total_price)
+            for _, order_data in valid
+        ],
     )
 
-    response = OrderResponse.model_validate(order)
-    await set_order_to_cache(
-        str(order.id),
-        json.dumps(response.model_dump(mode="json")),
-    )
+    cache_entries: dict[str, str] = {}
+    for (result, _), order in zip(valid, created):
+        result.order = OrderResponse.model_validate(order)
+        cache_entries[str(order.id)] = _to_cache_entry(result.order)
+    if ORDER_CACHE_POPULATE == "write":
+        await set_orders_to_cache(cache_entries)
 
-    return order
+    return OrderBulkResponse(results=results)
+
+
+_order_loads: SingleFlight[CachedOrder] = SingleFlight()
+
+
+async def _wait_for_cached_order(order_id: UUID) -> CachedOrder | None:
+    deadline = time.monotonic() + ORDER_CACHE_LOCK_WAIT_MS / 1000
+    while time.monotonic() < deadline:
+        cached = await peek_order_in_cache(str(order_id))
+        if cached and (entry := _from_cache_entry(cached)):
+            return entry
+        await asyncio.sleep(ORDER_CACHE_LOCK_POLL_MS / 1000)
+    return None
 
 
-async def get_order_by_id(db: AsyncSession, order_id: UUID) -> OrderResponse:
+async def _load_order(db: AsyncSession, order_id: UUID) -> CachedOrder:
+    lock_token = await acquire_order_lock(str(order_id))
+    if lock_token is None:
+        cached = await _wait_for_cached_order(order_id)
+        if cached is not None:
+            return cached
+
+    try:
+        repo = OrderRepository(db)
+        started = time.monotonic()
+        order = await repo.get_by_id(order_id)
+        if not order:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order not found",
+            )
+
+        cache_entry = _to_cache_entry(OrderResponse.model_validate(order))
+        await set_order_to_cache(str(order_id), cache_entry)
+        record_order_recompute(time.monotonic() - started)
+        return _from_cache_entry(cache_entry)
+    finally:
+        if lock_token is not None:
+            await release_order_lock(str(order_id), lock_token)
+
+
+async def get_order_by_id(db: AsyncSession, order_id: UUID) -> CachedOrder:
     cached = await get_order_from_cache(str(order_id))
-    if cached:
-        data = json.loads(cached)
-        return OrderResponse(**data)
+    if cached and (entry := _from_cache_entry(cached)):
+        return entry
+
+    return await _order_loads.do(str(order_id), lambda: _load_order(db, order_id))
+
+
+async def get_orders_by_ids(
+    db: AsyncSession,
+    order_ids: list[UUID],
+) -> tuple[list[CachedOrder], list[UUID]]:
+    order_ids = list(dict.fromkeys(order_ids))
+    cached = await get_orders_from_cache([str(order_id) for order_id in order_ids])
+
+    entries: dict[UUID, CachedOrder] = {}
+    misses: list[UUID] = []
+    for order_id in order_ids:
+        raw = cached.get(str(order_id))
+        if raw and (entry := _from_cache_entry(raw)):
+            entries[order_id] = entry
+        else:
+            misses.append(order_id)
 
+    if misses:
+        entries.update(await cache_orders(db, misses))
+
+    found = [entries[order_id] for order_id in order_ids if order_id in entries]
+    missing = [order_id for order_id in order_ids if order_id not in entries]
+    return found, missing
+
+
+async def cache_orders(
+    db: AsyncSession,
+    order_ids: list[UUID],
+    local: bool = True,
+    nx: bool = False,
+) -> dict[UUID, CachedOrder]:
     repo = OrderRepository(db)
-    order = await repo.get_by_id(order_id)
-    if not order:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Order not found",
-        )
+    entries: dict[UUID, CachedOrder] = {}
+    cache_entries: dict[str, str] = {}
+    for order in await repo.get_by_ids(order_ids):
+        cache_entry = _to_cache_entry(OrderResponse.model_validate(order))
+        cache_entries[str(order.id)] = cache_entry
+        entries[order.id] = _from_cache_entry(cache_entry)
+    if cache_entries:
+        await set_orders_to_cache(cache_entries, local=local, nx=nx)
+    return entries
 
-    response = OrderResponse.model_validate(order)
-    await set_order_to_cache(
-        str(order_id),
-        json.dumps(response.model_dump(mode="json")),
+
+async def _update_cached_orders(responses: dict[UUID, OrderResponse]) -> None:
+    # Refreshed under every populate policy: in event mode the consumer only
+    # fills missing keys, so it can never overwrite this newer status.
+    await refresh_orders_cache(
+        {
+            str(order_id): _to_cache_entry(response)
+            for order_id, response in responses.items()
+        }
     )
-    return response
 
 
 async def update_order_status(
@@ -88,16 +253,76 @@ async def update_order_status(
             detail="Order not found",
         )
 
-    await invalidate_order_cache(str(order_id))
-
     response = OrderResponse.model_validate(order)
-    await set_order_to_cache(
-        str(order_id),
-        json.dumps(response.model_dump(mode="json")),
-    )
+    await _update_cached_orders({order_id: response})
     return response
 
 
-async def get_user_orders(db: AsyncSession, user_id: int) -> list[Order]:
+async def update_order_statuses(
+    db: AsyncSession,
+    changes: list[OrderStatusChange],
+) -> OrderBatchResponse:
+    requested = {change.id: change.status for change in changes}
+
+    repo = OrderRepository(db)
+    updated = await repo.update_statuses(requested)
+
+    responses = {order.id: OrderResponse.model_validate(order) for order in updated}
+    if responses:
+        await _update_cached_orders(responses)
+
+    return OrderBatchResponse(
+        items=[responses[order_id] for order_id in requested if order_id in responses],
+        missing=[order_id for order_id in requested if order_id not in responses],
+    )
+
+
+async def get_user_orders(
+    db: AsyncSession,
+    user_id: int,
+    limit: int,
+    cursor: str | None = None,
+) -> OrderPage:
+    repo = OrderRepository(db)
+
+    after = _decode_cursor(cursor) if cursor else None
+    orders = await repo.get_by_user_id(user_id, limit=limit + 1, after=after)
+    return _to_page(orders, limit)
+
+
+async def search_user_orders(
+    db: AsyncSession,
+    user_id: int,
+    limit: int,
+    cursor: str | None = None,
+    product_id: int | None = None,
+    order_status: OrderStatus | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> OrderPage:
+    repo = OrderRepository(db)
+
+    orders = await repo.search(
+        user_id,
+        limit=limit + 1,
+        after=_decode_cursor(cursor) if cursor else None,
+        product_id=product_id,
+        status=order_status,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return _to_page(orders, limit)
+
+
+def _to_page(orders: list[Order], limit: int) -> OrderPage:
+    next_cursor = _encode_cursor(orders[limit - 1]) if len(orders) > limit else None
+    return OrderPage(
+        items=[OrderResponse.model_validate(order) for order in orders[:limit]],
+        next_cursor=next_cursor,
+    )
+
+
+async def stream_user_orders(db: AsyncSession, user_id: int) -> AsyncIterator[str]:
     repo = OrderRepository(db)
-    return await repo.get_by_user_id(user_id)
+    async for order in repo.stream_by_user_id(user_id):
+        yield OrderResponse.model_validate(order).model_dump_json() + "\n"
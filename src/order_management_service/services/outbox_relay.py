@@ -0,0 +1,66 @@
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.order_management_service.core.database import async_session_maker
+from src.order_management_service.core.kafka import (
+    send_new_order_event,
+    start_kafka_producer,
+    stop_kafka_producer,
+)
+from src.order_management_service.core.settings import (
+    OUTBOX_RELAY_BATCH_SIZE,
+    OUTBOX_RELAY_POLL_INTERVAL_SECONDS,
+)
+from src.order_management_service.repositories.outbox_repository import (
+    OutboxRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def relay_outbox_batch(
+    db: AsyncSession,
+    batch_size: int = OUTBOX_RELAY_BATCH_SIZE,
+) -> int:
+    repo = OutboxRepository(db)
+
+    events = await repo.lock_pending(batch_size)
+    if not events:
+        await db.commit()
+        return 0
+
+    deliveries = [
+        await send_new_order_event(**event.payload, wait=False) for event in events
+    ]
+    await asyncio.gather(*deliveries)
+
+    await repo.delete([event.id for event in events])
+    await db.commit()
+    return len(events)
+
+
+async def run_outbox_relay() -> None:
+    while True:
+        try:
+            async with async_session_maker() as db:
+                relayed = await relay_outbox_batch(db)
+        except Exception:
+            logger.exception("Outbox relay batch failed")
+            relayed = 0
+
+        if relayed < OUTBOX_RELAY_BATCH_SIZE:
+            await asyncio.sleep(OUTBOX_RELAY_POLL_INTERVAL_SECONDS)
+
+
+async def _run_standalone_relay() -> None:
+    await start_kafka_producer()
+    try:
+        await run_outbox_relay()
+    finally:
+        await stop_kafka_producer()
+
+
+def run_relay() -> None:
+    asyncio.run(_run_standalone_relay())
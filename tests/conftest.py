@@ -1,18 +1,28 @@
 import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from src.order_management_service.core.database import Base, get_db
-from src.order_management_service.core.rate_limiter import rate_limiter_dependency
+from src.order_management_service.core import security as security_module
+from src.order_management_service.core.database import Base, get_db, instrument_engine
+from src.order_management_service.core.kafka import (
+    InMemoryProducer,
+    start_kafka_producer,
+    stop_kafka_producer,
+)
+from src.order_management_service.core.rate_limiter import (
+    login_rate_limiter,
+    orders_rate_limiter,
+)
 from src.order_management_service.main import app
 from src.order_management_service.services import order_service as order_service_module
 
-
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
-engine = create_async_engine(SQLALCHEMY_DATABASE_URL, future=True)
+engine = instrument_engine(create_async_engine(SQLALCHEMY_DATABASE_URL, future=True))
 TestingSessionLocal = async_sessionmaker(
     engine,
     expire_on_commit=False,
@@ -27,6 +37,7 @@ async def _create_db() -> None:
 async def _drop_db() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
 
 
 async def override_get_db() -> AsyncSession:
@@ -38,14 +49,16 @@ async def _noop_rate_limiter() -> None:
     return None
 
 
-async def _fake_send_new_order_event(
-    order_id: str,
-    user_id: int,
-    total_price: float,
-    status: str,
-    items: list[dict],
-) -> None:
-    return None
+broker = InMemoryProducer()
+
+
+@asynccontextmanager
+async def _test_lifespan(_app) -> AsyncIterator[None]:
+    await start_kafka_producer(broker)
+    try:
+        yield
+    finally:
+        await stop_kafka_producer()
 
 
 _ORDER_CACHE: dict[str, str] = {}
@@ -55,6 +68,22 @@ async def _fake_get_order_from_cache(order_id: str) -> str | None:
     return _ORDER_CACHE.get(order_id)
 
 
+async def _fake_get_orders_from_cache(order_ids: list[str]) -> dict[str, str]:
+    return {
+        order_id: _ORDER_CACHE[order_id]
+        for order_id in order_ids
+        if order_id in _ORDER_CACHE
+    }
+
+
+async def _fake_acquire_order_lock(order_id: str) -> str | None:
+    return "lock-token"
+
+
+async def _fake_release_order_lock(order_id: str, token: str) -> None:
+    return None
+
+
 async def _fake_set_order_to_cache(
     order_id: str,
     data: str,
@@ -63,23 +92,54 @@ async def _fake_set_order_to_cache(
     _ORDER_CACHE[order_id] = data
 
 
-async def _fake_invalidate_order_cache(order_id: str) -> None:
-    _ORDER_CACHE.pop(order_id, None)
+async def _fake_set_orders_to_cache(
+    entries: dict[str, str],
+    ttl_seconds: int = 300,
+    local: bool = True,
+    nx: bool = False,
+) -> None:
+    for order_id, data in entries.items():
+        if nx:
+            _ORDER_CACHE.setdefault(order_id, data)
+        else:
+            _ORDER_CACHE[order_id] = data
+
+
+_REVOKED_TOKENS: set[str] = set()
+
+
+async def _fake_store_token_revocation(jti: str, expires_at: int) -> None:
+    _REVOKED_TOKENS.add(jti)
+
+
+async def _fake_is_token_revoked(jti: str) -> bool:
+    return jti in _REVOKED_TOKENS
 
 
 app.dependency_overrides[get_db] = override_get_db
-app.dependency_overrides[rate_limiter_dependency] = _noop_rate_limiter
+app.dependency_overrides[login_rate_limiter] = _noop_rate_limiter
+app.dependency_overrides[orders_rate_limiter] = _noop_rate_limiter
+
+app.router.lifespan_context = _test_lifespan
+
+security_module.store_token_revocation = _fake_store_token_revocation
+security_module.is_token_revoked = _fake_is_token_revoked
 
-order_service_module.send_new_order_event = _fake_send_new_order_event
 order_service_module.get_order_from_cache = _fake_get_order_from_cache
+order_service_module.get_orders_from_cache = _fake_get_orders_from_cache
+order_service_module.peek_order_in_cache = _fake_get_order_from_cache
+order_service_module.acquire_order_lock = _fake_acquire_order_lock
+order_service_module.release_order_lock = _fake_release_order_lock
 order_service_module.set_order_to_cache = _fake_set_order_to_cache
-order_service_module.invalidate_order_cache = _fake_invalidate_order_cache
+order_service_module.set_orders_to_cache = _fake_set_orders_to_cache
+order_service_module.refresh_orders_cache = _fake_set_orders_to_cache
 
 
 @pytest.fixture(scope="function")
 def client() -> TestClient:
     asyncio.run(_drop_db())
     asyncio.run(_create_db())
+    broker.messages.clear()
     with TestClient(app) as c:
         yield c
     asyncio.run(_drop_db())
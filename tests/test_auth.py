@@ -1,5 +1,7 @@
 from fastapi.testclient import TestClient
 
+from src.order_management_service.core import security as security_module
+
 
 def test_register_user(client: TestClient) -> None:
     payload = {
@@ -51,3 +53,77 @@ def test_login_and_get_token(client: TestClient) -> None:
     token_data = token_response.json()
     assert "access_token" in token_data
     assert token_data["token_type"] == "bearer"
+
+
+def test_password_hashing_sheds_load_when_pool_is_full(
+    client: TestClient,
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(security_module, "PASSWORD_HASH_MAX_PENDING", 0)
+
+    response = client.post(
+        "/register/",
+        json={"email": "busy@example.com", "password": "secret123"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_password_hash_stats(client: TestClient) -> None:
+    headers = {"Authorization": f"Bearer {_login(client, 'admin@example.com')}"}
+    before = client.get("/internal/password-hash/stats", headers=headers).json()
+
+    client.post(
+        "/register/",
+        json={"email": "stats@example.com", "password": "secret123"},
+    )
+
+    after = client.get("/internal/password-hash/stats", headers=headers).json()
+    assert after["completed"] == before["completed"] + 1
+    assert after["pending"] == 0
+
+
+def _login(client: TestClient, email: str) -> str:
+    client.post("/register/", json={"email": email, "password": "secret123"})
+    response = client.post(
+        "/token/",
+        data={"username": email, "password": "secret123"},
+    )
+    return response.json()["access_token"]
+
+
+def test_verified_tokens_are_cached(client: TestClient, monkeypatch) -> None:
+    token = _login(client, "cached@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    decode_calls = 0
+    real_decode = security_module.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        nonlocal decode_calls
+        decode_calls += 1
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(security_module.jwt, "decode", counting_decode)
+
+    for _ in range(3):
+        response = client.get("/orders/user/1/", headers=headers)
+        assert response.status_code == 200
+
+    assert decode_calls == 1
+
+
+def test_logout_revokes_token(client: TestClient) -> None:
+    token = _login(client, "logout@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/orders/user/1/", headers=headers).status_code == 200
+
+    logout_response = client.post("/logout/", headers=headers)
+    assert logout_response.status_code == 204
+
+    assert client.get("/orders/user/1/", headers=headers).status_code == 401
+
+    fresh_token = _login(client, "logout@example.com")
+    fresh_headers = {"Authorization": f"Bearer {fresh_token}"}
+    assert client.get("/orders/user/1/", headers=fresh_headers).status_code == 200
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from redis.exceptions import RedisError
+from sqlalchemy import exc, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.order_management_service.core import database
+from src.order_management_service.core.database import (
+    InstrumentedPool,
+    RoutingAsyncSession,
+    RoutingSession,
+    _pool_stats,
+    bind_db_user,
+    get_pool_stats,
+)
+from src.order_management_service.core.local_cache import LocalCache
+from src.order_management_service.models.user import User
+
+
+def test_instrumented_pool_counts_checkouts_and_timeouts() -> None:
+    async def scenario() -> None:
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///./test.db",
+            poolclass=InstrumentedPool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+            pool_logging_name="timeouts",
+        )
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                assert engine.pool.checkedout() == 1
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
+
+    stats = _pool_stats["timeouts"]
+    assert (stats["checkouts"], stats["timeouts"], stats["waiting"]) == (1, 1, 0)
+    assert "timeouts" not in get_pool_stats()
+
+
+@pytest.fixture
+def replica_routing(monkeypatch: pytest.MonkeyPatch):
+    primary = create_async_engine("sqlite+aiosqlite:///./test.db")
+    replica = create_async_engine("sqlite+aiosqlite:///./test.db")
+    monkeypatch.setattr(database, "engine", primary)
+    monkeypatch.setattr(database, "replica_engine", replica)
+    monkeypatch.setattr(
+        database, "_sticky_users", LocalCache(maxsize=10, ttl_seconds=60)
+    )
+    monkeypatch.setitem(database._replica_state, "healthy", True)
+    return primary.sync_engine, replica.sync_engine
+
+
+def test_routing_session_reads_from_replica_until_it_writes(replica_routing) -> None:
+    primary, replica = replica_routing
+    session = RoutingSession()
+    read = select(User)
+
+    assert session.get_bind(clause=read) is replica
+    assert session.get_bind(clause=read.execution_options(use_primary=True)) is primary
+    assert session.get_bind(clause=read.with_for_update()) is primary
+    assert session.get_bind(clause=update(User).values(is_active=False)) is primary
+    assert session.get_bind(clause=read) is primary
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.ttls: dict[str, int] = {}
+        self.fail = False
+
+    async def set(self, key: str, value: int, px: int) -> None:
+        self.ttls[key] = px
+
+    async def exists(self, key: str) -> int:
+        if self.fail:
+            raise RedisError("down")
+        return int(key in self.ttls)
+
+
+def test_committed_writes_keep_the_user_on_primary_in_every_worker(
+    replica_routing,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    primary, replica = replica_routing
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(database, "redis_client", fake_redis)
+    read = select(User)
+
+    async def write_as(user_id: int) -> None:
+        await bind_db_user(user_id)
+        async with RoutingAsyncSession(sync_session_class=RoutingSession) as session:
+            # Any statement other than a plain SELECT counts as a write.
+            await session.execute(text("SELECT 1"))
+            await session.commit()
+        await database.engine.dispose()
+
+    async def bind_for(user_id: int) -> Engine:
+        # A fresh worker: nothing about the user is known locally.
+        database._sticky_users.clear()
+        await bind_db_user(user_id)
+        return RoutingSession().get_bind(clause=read)
+
+    asyncio.run(write_as(1))
+    assert fake_redis.ttls == {"db:sticky:1": 5000}
+    assert asyncio.run(bind_for(1)) is primary
+    assert asyncio.run(bind_for(2)) is replica
+
+    fake_redis.fail = True
+    assert asyncio.run(bind_for(2)) is primary
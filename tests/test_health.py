@@ -1,8 +1,34 @@
 from fastapi.testclient import TestClient
 
+from tests.test_orders import _auth_headers, _register_and_login
+
 
 def test_health(client: TestClient) -> None:
     response = client.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
+
+
+def test_internal_endpoints_require_auth(client: TestClient) -> None:
+    response = client.get("/internal/cache/stats")
+    assert response.status_code == 401
+
+
+def test_order_cache_stats(client: TestClient) -> None:
+    _, token = _register_and_login(client)
+    response = client.get("/internal/cache/stats", headers=_auth_headers(token))
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"l1", "l2", "writer"}
+    assert set(data["l2"]) == {"hits", "misses", "early_refreshes"}
+    assert set(data["writer"]) == {"writes", "coalesced", "flushes"}
+
+
+def test_db_pool_stats(client: TestClient) -> None:
+    _, token = _register_and_login(client)
+    response = client.get("/internal/db/pool", headers=_auth_headers(token))
+    assert response.status_code == 200
+    data = response.json()["primary"]
+    assert {"size", "checked_out", "overflow", "waiting", "timeouts"} <= set(data)
+    assert max(data["wait_buckets"].values()) <= data["checkouts"] + data["timeouts"]
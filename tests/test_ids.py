@@ -0,0 +1,18 @@
+from uuid import RFC_4122, UUID
+
+from src.order_management_service.core.ids import uuid7
+
+
+def test_uuid7_is_rfc_version_7() -> None:
+    value = uuid7()
+
+    assert isinstance(value, UUID)
+    assert value.version == 7
+    assert value.variant == RFC_4122
+
+
+def test_uuid7_is_monotonic_within_process() -> None:
+    values = [uuid7() for _ in range(10_000)]
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
@@ -0,0 +1,76 @@
+import asyncio
+
+from src.order_management_service.core import kafka as kafka_module
+
+
+class _RecordingProducer:
+    def __init__(self) -> None:
+        self.started = False
+        self.sent: list[tuple[str, str | None, dict]] = []
+        self.pending: list[asyncio.Future] = []
+
+    async def start(self) -> None:
+        self.started = True
+
+    async def stop(self) -> None:
+        self.started = False
+
+    async def send(
+        self,
+        topic: str,
+        value: dict,
+        key: str | None = None,
+    ) -> asyncio.Future:
+        self.sent.append((topic, key, value))
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append(future)
+        return future
+
+
+async def _send_event(wait: bool) -> asyncio.Future | None:
+    return await kafka_module.send_new_order_event(
+        order_id="order-1",
+        user_id=1,
+        total_price=10.0,
+        status="PENDING",
+        items=[{"product_id": 1, "quantity": 1, "price": 10.0}],
+        wait=wait,
+    )
+
+
+def test_shared_producer_is_reused_across_sends() -> None:
+    producer = _RecordingProducer()
+
+    async def scenario() -> None:
+        await kafka_module.start_kafka_producer(producer)
+        try:
+            first = await _send_event(wait=False)
+            second = await _send_event(wait=False)
+            assert first is not None and not first.done()
+            assert second is not None and not second.done()
+            assert kafka_module.get_producer() is producer
+        finally:
+            await kafka_module.stop_kafka_producer()
+
+    asyncio.run(scenario())
+
+    assert len(producer.sent) == 2
+    assert producer.sent[0][:2] == ("new_order", "1")
+    assert not producer.started
+
+
+def test_send_waits_for_broker_ack_when_requested() -> None:
+    producer = _RecordingProducer()
+
+    async def scenario() -> None:
+        await kafka_module.start_kafka_producer(producer)
+        try:
+            send = asyncio.create_task(_send_event(wait=True))
+            await asyncio.sleep(0)
+            assert not send.done()
+            producer.pending[0].set_result(None)
+            assert await send is None
+        finally:
+            await kafka_module.stop_kafka_producer()
+
+    asyncio.run(scenario())
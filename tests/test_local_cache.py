@@ -0,0 +1,39 @@
+import time
+
+from src.order_management_service.core.local_cache import LocalCache
+
+
+def test_local_cache_evicts_least_recently_used() -> None:
+    cache: LocalCache[str] = LocalCache(maxsize=2, ttl_seconds=60)
+
+    cache.set("order:1", "one")
+    cache.set("order:2", "two")
+    assert cache.get("order:1") == "one"
+
+    cache.set("order:3", "three")
+
+    assert cache.get("order:2") is None
+    assert cache.get("order:1") == "one"
+    assert cache.get("order:3") == "three"
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2}
+
+
+def test_local_cache_expires_entries() -> None:
+    cache: LocalCache[str] = LocalCache(maxsize=10, ttl_seconds=0.01)
+
+    cache.set("order:1", "one")
+    assert cache.get("order:1") == "one"
+
+    time.sleep(0.02)
+
+    assert cache.get("order:1") is None
+    assert len(cache) == 0
+
+
+def test_local_cache_never_outlives_its_own_ttl() -> None:
+    cache: LocalCache[str] = LocalCache(maxsize=10, ttl_seconds=0.01)
+
+    cache.set("order:1", "one", ttl_seconds=300)
+    time.sleep(0.02)
+
+    assert cache.get("order:1") is None
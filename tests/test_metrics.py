@@ -0,0 +1,51 @@
+from fastapi.testclient import TestClient
+
+from src.order_management_service.core.metrics import Histogram, _registry
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = Histogram("test_latency_seconds", "Test.", ("op",), buckets=(0.1, 1.0))
+    try:
+        histogram.observe(0.05, "read")
+        histogram.observe(0.1, "read")
+        histogram.observe(3.0, "read")
+
+        assert histogram.render().splitlines()[2:] == [
+            'test_latency_seconds_bucket{op="read",le="0.1"} 2',
+            'test_latency_seconds_bucket{op="read",le="1.0"} 2',
+            'test_latency_seconds_bucket{op="read",le="+Inf"} 3',
+            'test_latency_seconds_sum{op="read"} 3.15',
+            'test_latency_seconds_count{op="read"} 3',
+        ]
+    finally:
+        _registry.remove(histogram)
+
+
+def test_metrics_endpoint_reports_requests_and_dependencies(client: TestClient) -> None:
+    client.post("/register/", json={"email": "metrics@example.com", "password": "x"})
+    token = client.post(
+        "/token/",
+        data={"username": "metrics@example.com", "password": "x"},
+    ).json()["access_token"]
+    client.post(
+        "/orders/",
+        json={
+            "items": [{"product_id": 1, "quantity": 1, "price": 1.0}],
+            "total_price": 1.0,
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    client.get("/no-such-route")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert (
+        'http_request_duration_seconds_count{method="POST",route="/orders/",status="201"}'
+        in body
+    )
+    assert 'route="unmatched",status="404"' in body
+    assert 'dependency_duration_seconds_count{dependency="password_hash"' in body
+    assert "# TYPE order_cache_hit_ratio gauge" in body
+    assert "# TYPE rate_limit_rejections_total counter" in body
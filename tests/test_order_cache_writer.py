@@ -0,0 +1,197 @@
+import asyncio
+from typing import Self
+
+from src.order_management_service.core import redis as redis_module
+from src.order_management_service.core.redis import OrderCacheWriter, order_local_cache
+
+
+class _FakePipeline:
+    def __init__(
+        self,
+        executed: list[list[tuple]],
+        fail: bool = False,
+        delay: float = 0,
+    ) -> None:
+        self.executed = executed
+        self.fail = fail
+        self.delay = delay
+        self.commands: list[tuple] = []
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        self.commands.append(("setex", key, value))
+
+    def set(self, key: str, value: str, ex: int, nx: bool) -> None:
+        self.commands.append(("setnx" if nx else "set", key, value))
+
+    def delete(self, key: str) -> None:
+        self.commands.append(("delete", key))
+
+    def publish(self, channel: str, message: str) -> None:
+        self.commands.append(("publish", message.partition(":")[2]))
+
+    async def execute(self) -> list:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("redis unavailable")
+        self.executed.append(self.commands)
+        return [True] * len(self.commands)
+
+
+class _FakeRedis:
+    def __init__(self, fail: bool = False, delay: float = 0) -> None:
+        self.executed: list[list[tuple]] = []
+        self.fail = fail
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _TrackedPipeline(self)
+
+
+class _TrackedPipeline(_FakePipeline):
+    def __init__(self, redis: _FakeRedis) -> None:
+        super().__init__(redis.executed, redis.fail, redis.delay)
+        self.redis = redis
+
+    async def execute(self) -> list:
+        self.redis.in_flight += 1
+        self.redis.max_in_flight = max(self.redis.max_in_flight, self.redis.in_flight)
+        try:
+            return await super().execute()
+        finally:
+            self.redis.in_flight -= 1
+
+
+def test_concurrent_writes_are_coalesced_into_one_pipeline(monkeypatch) -> None:
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(redis_module, "redis_client", fake_redis)
+    writer = OrderCacheWriter(max_delay_ms=5)
+
+    async def scenario() -> None:
+        await asyncio.gather(
+            writer.write({"a": "1"}),
+            writer.write({"b": "1"}, publish=True),
+            writer.write({"a": "2"}),
+            writer.write({"c": None}, publish=True),
+        )
+
+    asyncio.run(scenario())
+
+    assert fake_redis.executed == [
+        [
+            ("setex", "order:a", "2"),
+            ("setex", "order:b", "1"),
+            ("publish", "order:b"),
+            ("delete", "order:c"),
+            ("publish", "order:c"),
+        ]
+    ]
+    assert writer.stats == {"writes": 4, "coalesced": 1, "flushes": 1}
+    assert order_local_cache.get("order:a") == "2"
+
+
+def test_full_batch_flushes_without_waiting(monkeypatch) -> None:
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(redis_module, "redis_client", fake_redis)
+    writer = OrderCacheWriter(max_batch_size=2, max_delay_ms=10_000)
+
+    asyncio.run(asyncio.wait_for(writer.write({"a": "1", "b": "1"}), timeout=1))
+
+    assert len(fake_redis.executed) == 1
+
+
+def test_flush_failure_is_raised_to_every_writer(monkeypatch) -> None:
+    monkeypatch.setattr(redis_module, "redis_client", _FakeRedis(fail=True))
+    writer = OrderCacheWriter(max_delay_ms=1)
+
+    async def scenario() -> list:
+        return await asyncio.gather(
+            writer.write({"a": "1"}),
+            writer.write({"b": "1"}),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_cancelled_writer_does_not_strand_the_batch(monkeypatch) -> None:
+    fake_redis = _FakeRedis(delay=0.02)
+    monkeypatch.setattr(redis_module, "redis_client", fake_redis)
+    writer = OrderCacheWriter(max_batch_size=2, max_delay_ms=10_000)
+
+    async def scenario() -> None:
+        first = asyncio.create_task(writer.write({"a": "1"}))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(writer.write({"b": "1"}))
+        await asyncio.sleep(0.005)
+        second.cancel()
+        await asyncio.wait_for(first, timeout=1)
+
+    asyncio.run(scenario())
+
+    assert fake_redis.executed == [
+        [("setex", "order:a", "1"), ("setex", "order:b", "1")]
+    ]
+
+
+def test_flushes_never_overlap_and_keep_write_order(monkeypatch) -> None:
+    fake_redis = _FakeRedis(delay=0.01)
+    monkeypatch.setattr(redis_module, "redis_client", fake_redis)
+    writer = OrderCacheWriter(max_batch_size=2, max_delay_ms=1)
+
+    async def scenario() -> None:
+        first = asyncio.create_task(writer.write({"a": "old", "b": "1"}))
+        await asyncio.sleep(0.002)
+        await asyncio.gather(first, writer.write({"a": None, "c": "1"}))
+
+    asyncio.run(scenario())
+
+    assert fake_redis.max_in_flight == 1
+    assert fake_redis.executed == [
+        [("setex", "order:a", "old"), ("setex", "order:b", "1")],
+        [("delete", "order:a"), ("setex", "order:c", "1")],
+    ]
+
+
+def test_empty_write_returns_immediately(monkeypatch) -> None:
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(redis_module, "redis_client", fake_redis)
+    writer = OrderCacheWriter(max_delay_ms=10_000)
+
+    asyncio.run(asyncio.wait_for(writer.write({}), timeout=1))
+
+    assert fake_redis.executed == []
+    assert writer._flush_task is None
+
+
+def test_missing_only_writes_never_replace_pending_writes(monkeypatch) -> None:
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(redis_module, "redis_client", fake_redis)
+    writer = OrderCacheWriter(max_delay_ms=5)
+    order_local_cache.clear()
+
+    async def scenario() -> None:
+        await asyncio.gather(
+            writer.write({"a": "new"}, publish=True),
+            writer.write({"a": "snapshot", "b": "snapshot"}, local=False, nx=True),
+        )
+
+    asyncio.run(scenario())
+
+    assert fake_redis.executed == [
+        [
+            ("setex", "order:a", "new"),
+            ("publish", "order:a"),
+            ("setnx", "order:b", "snapshot"),
+        ]
+    ]
+    assert order_local_cache.get("order:b") is None
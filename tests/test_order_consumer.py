@@ -0,0 +1,221 @@
+import asyncio
+from uuid import UUID, uuid4
+
+import pytest
+from aiokafka import ConsumerRecord, TopicPartition
+
+from src.order_management_service.core.metrics import render_metrics
+from src.order_management_service.services import order_consumer
+
+
+def _record(partition: int, offset: int, key: bytes | None = None) -> ConsumerRecord:
+    return ConsumerRecord(
+        topic="new_order",
+        partition=partition,
+        offset=offset,
+        timestamp=0,
+        timestamp_type=0,
+        key=key,
+        value={"order_id": f"order-{partition}-{offset}"},
+        checksum=None,
+        serialized_key_size=0,
+        serialized_value_size=0,
+        headers=(),
+    )
+
+
+class _FakeConsumer:
+    def __init__(self, batches: dict[TopicPartition, list[ConsumerRecord]]) -> None:
+        self.log = {partition: list(records) for partition, records in batches.items()}
+        self.positions = {
+            partition: records[0].offset for partition, records in batches.items()
+        }
+        self.assigned = set(batches)
+        self.committed: list[dict[TopicPartition, int]] = []
+        self.seeks: list[tuple[TopicPartition, int]] = []
+
+    async def getmany(self, timeout_ms: int, max_records: int) -> dict:
+        await asyncio.sleep(0)
+        batches = {}
+        for partition, records in self.log.items():
+            pending = [r for r in records if r.offset >= self.positions[partition]]
+            if pending:
+                batches[partition] = pending
+                self.positions[partition] = pending[-1].offset + 1
+        return batches
+
+    def seek(self, partition: TopicPartition, offset: int) -> None:
+        self.seeks.append((partition, offset))
+        self.positions[partition] = offset
+
+    async def commit(self, offsets: dict[TopicPartition, int]) -> None:
+        self.committed.append(offsets)
+
+    def assignment(self) -> set[TopicPartition]:
+        return self.assigned
+
+    def highwater(self, partition: TopicPartition) -> int:
+        return 25
+
+
+class _FakeTask:
+    def __init__(self, fail_on: str | None = None, delays: dict | None = None) -> None:
+        self.enqueued: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_on = fail_on
+        self.delays = delays or {}
+
+    async def kiq(self, order_id: str) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delays.get(order_id, 0.001))
+        self.in_flight -= 1
+        if order_id == self.fail_on:
+            raise ConnectionError("broker unavailable")
+        self.enqueued.append(order_id)
+
+
+def test_batch_is_enqueued_with_bounded_concurrency_then_committed(monkeypatch) -> None:
+    task = _FakeTask()
+    monkeypatch.setattr(order_consumer, "process_order_task", task)
+    monkeypatch.setattr(order_consumer, "CONSUMER_MAX_IN_FLIGHT", 3)
+    first, second = TopicPartition("new_order", 0), TopicPartition("new_order", 1)
+    consumer = _FakeConsumer(
+        {
+            first: [_record(0, offset) for offset in range(10, 20)],
+            second: [_record(1, offset) for offset in range(5)],
+        }
+    )
+
+    listener = order_consumer.DrainingRebalanceListener()
+
+    assert asyncio.run(order_consumer.process_next_batch(consumer, listener)) == 15
+    assert len(task.enqueued) == 15
+    assert task.max_in_flight <= 3
+    assert consumer.committed == [{first: 20, second: 5}]
+    assert 'kafka_consumer_lag{topic="new_order",partition="0"} 5' in render_metrics()
+    assert 'kafka_consumer_lag{topic="new_order",partition="1"} 20' in render_metrics()
+
+    assert asyncio.run(order_consumer.process_next_batch(consumer, listener)) == 0
+    assert 'kafka_consumer_lag{topic="new_order",partition="0"} 0' in render_metrics()
+
+
+def test_batch_is_not_committed_when_enqueue_fails(monkeypatch) -> None:
+    task = _FakeTask(fail_on="order-0-1")
+    monkeypatch.setattr(order_consumer, "process_order_task", task)
+    partition = TopicPartition("new_order", 0)
+    consumer = _FakeConsumer({partition: [_record(0, offset) for offset in range(3)]})
+
+    listener = order_consumer.DrainingRebalanceListener()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(order_consumer.process_next_batch(consumer, listener))
+
+    assert consumer.committed == []
+    assert consumer.seeks == [(partition, 0)]
+
+
+def test_consumer_loop_redelivers_a_failed_batch_after_backoff(monkeypatch) -> None:
+    task = _FakeTask(fail_on="order-0-1")
+    monkeypatch.setattr(order_consumer, "process_order_task", task)
+    monkeypatch.setattr(order_consumer, "CONSUMER_RETRY_BACKOFF_MS", 1)
+    partition = TopicPartition("new_order", 0)
+    consumer = _FakeConsumer({partition: [_record(0, offset) for offset in range(3)]})
+
+    async def scenario() -> None:
+        loop = asyncio.create_task(
+            order_consumer.consume_batches(
+                consumer, order_consumer.DrainingRebalanceListener()
+            )
+        )
+        while not consumer.committed:
+            await asyncio.sleep(0.001)
+            if len(consumer.seeks) == 1:
+                task.fail_on = None
+        loop.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await loop
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+    assert consumer.seeks == [(partition, 0)]
+    assert consumer.committed[0] == {partition: 3}
+    assert sorted(task.enqueued[-3:]) == ["order-0-0", "order-0-1", "order-0-2"]
+
+
+def test_event_populate_policy_caches_orders_before_enqueueing(monkeypatch) -> None:
+    task = _FakeTask()
+    monkeypatch.setattr(order_consumer, "process_order_task", task)
+    monkeypatch.setattr(order_consumer, "ORDER_CACHE_POPULATE", "event")
+    cached: list[tuple[list[UUID], list[str]]] = []
+
+    async def fake_cache_orders(
+        db,
+        order_ids: list[UUID],
+        local: bool = True,
+        nx: bool = False,
+    ) -> dict:
+        assert not local
+        assert nx
+        cached.append((order_ids, list(task.enqueued)))
+        return {}
+
+    monkeypatch.setattr(order_consumer, "cache_orders", fake_cache_orders)
+    order_id = uuid4()
+    partition = TopicPartition("new_order", 0)
+    record = _record(0, 0)
+    record.value["order_id"] = str(order_id)
+    consumer = _FakeConsumer({partition: [record, _record(0, 1)]})
+
+    asyncio.run(
+        order_consumer.process_next_batch(
+            consumer, order_consumer.DrainingRebalanceListener()
+        )
+    )
+
+    assert cached == [([order_id], [])]
+    assert task.enqueued == [str(order_id), "order-0-1"]
+
+
+def test_batch_keeps_per_user_order(monkeypatch) -> None:
+    task = _FakeTask(delays={"order-0-0": 0.02})
+    monkeypatch.setattr(order_consumer, "process_order_task", task)
+    partition = TopicPartition("new_order", 0)
+    consumer = _FakeConsumer(
+        {
+            partition: [
+                _record(0, 0, key=b"1"),
+                _record(0, 1, key=b"2"),
+                _record(0, 2, key=b"1"),
+            ]
+        }
+    )
+
+    asyncio.run(
+        order_consumer.process_next_batch(
+            consumer, order_consumer.DrainingRebalanceListener()
+        )
+    )
+
+    assert task.enqueued.index("order-0-0") < task.enqueued.index("order-0-2")
+    assert task.enqueued[0] == "order-0-1"
+
+
+def test_revocation_waits_for_in_flight_batch(monkeypatch) -> None:
+    task = _FakeTask(delays={"order-0-0": 0.02})
+    monkeypatch.setattr(order_consumer, "process_order_task", task)
+    partition = TopicPartition("new_order", 0)
+    consumer = _FakeConsumer({partition: [_record(0, 0)]})
+    listener = order_consumer.DrainingRebalanceListener()
+
+    async def scenario() -> None:
+        batch = asyncio.create_task(
+            order_consumer.process_next_batch(consumer, listener)
+        )
+        await asyncio.sleep(0.005)
+        await listener.on_partitions_revoked({partition})
+        assert consumer.committed == [{partition: 1}]
+        await batch
+
+    asyncio.run(scenario())
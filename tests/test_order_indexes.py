@@ -0,0 +1,91 @@
+import asyncio
+import os
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.order_management_service.core.database import Base
+from src.order_management_service.models import order, outbox, user  # noqa: F401
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_POSTGRES_URL,
+    reason="TEST_POSTGRES_URL is not set",
+)
+
+
+async def _explain(query: str, params: dict) -> str:
+    engine = create_async_engine(TEST_POSTGRES_URL)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                text(
+                    "INSERT INTO users (id, email, hashed_password, is_active, created_at) "
+                    "SELECT g, 'user' || g || '@example.com', 'x', true, now() "
+                    "FROM generate_series(1, 200) AS g"
+                )
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO orders (id, user_id, items, total_price, status, created_at) "
+                    "SELECT gen_random_uuid(), 1 + g % 200, "
+                    "jsonb_build_array(jsonb_build_object('product_id', g % 1000)), 1.0, "
+                    "CASE WHEN g % 50 = 0 THEN 'PENDING' ELSE 'SHIPPED' END::orderstatus, "
+                    "now() - g * interval '1 second' "
+                    "FROM generate_series(1, 20000) AS g"
+                )
+            )
+            await conn.execute(text("ANALYZE orders"))
+            rows = await conn.execute(text(f"EXPLAIN {query}"), params)
+            plan = "\n".join(row[0] for row in rows)
+            await conn.run_sync(Base.metadata.drop_all)
+            return plan
+    finally:
+        await engine.dispose()
+
+
+def test_user_orders_page_uses_composite_index() -> None:
+    plan = asyncio.run(
+        _explain(
+            "SELECT * FROM orders WHERE user_id = :user_id "
+            "AND (created_at, id) < (:created_at, :id) "
+            "ORDER BY created_at DESC, id DESC LIMIT 50",
+            {
+                "user_id": 7,
+                "created_at": datetime.now(UTC).replace(tzinfo=None)
+                - timedelta(minutes=1),
+                "id": UUID("ffffffff-ffff-ffff-ffff-ffffffffffff"),
+            },
+        )
+    )
+
+    assert "ix_orders_user_id_created_at" in plan
+    assert "Sort" not in plan
+
+
+def test_active_status_filter_uses_partial_index() -> None:
+    plan = asyncio.run(
+        _explain(
+            "SELECT id FROM orders WHERE status = 'PENDING' ORDER BY created_at LIMIT 100",
+            {},
+        )
+    )
+
+    assert "ix_orders_active_status" in plan
+
+
+def test_product_filter_uses_gin_index() -> None:
+    plan = asyncio.run(
+        _explain(
+            "SELECT id FROM orders WHERE items @> CAST(:items AS jsonb)",
+            {"items": '[{"product_id": 7}]'},
+        )
+    )
+
+    assert "ix_orders_items" in plan
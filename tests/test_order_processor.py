@@ -0,0 +1,203 @@
+import asyncio
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+
+from src.order_management_service.models.order import Order, OrderStatus
+from src.order_management_service.services import order_processor
+from src.order_management_service.services.order_processor import OrderStatusBatcher
+from tests.conftest import TestingSessionLocal, engine
+from tests.test_orders import _auth_headers, _register_and_login
+
+
+def _create_orders(client: TestClient, token: str, count: int) -> list[UUID]:
+    order_ids = []
+    for _ in range(count):
+        response = client.post(
+            "/orders/",
+            json={
+                "items": [{"product_id": 1, "quantity": 1, "price": 10.0}],
+                "total_price": 10.0,
+            },
+            headers=_auth_headers(token),
+        )
+        order_ids.append(UUID(response.json()["id"]))
+    return order_ids
+
+
+async def _statuses(order_ids: list[UUID]) -> dict[UUID, OrderStatus]:
+    async with TestingSessionLocal() as session:
+        result = await session.execute(
+            select(Order.id, Order.status).where(Order.id.in_(order_ids))
+        )
+        return dict(result.all())
+
+
+def test_batcher_applies_concurrent_transitions_in_one_update(
+    client: TestClient,
+    monkeypatch,
+) -> None:
+    _, token = _register_and_login(client)
+    order_ids = _create_orders(client, token, 4)
+    invalidated: list[list[str]] = []
+
+    async def fake_invalidate(ids: list[str]) -> None:
+        invalidated.append(ids)
+
+    monkeypatch.setattr(order_processor, "invalidate_orders_cache", fake_invalidate)
+    updates: list[str] = []
+
+    def count_updates(conn, cursor, statement, *args) -> None:
+        if statement.startswith("UPDATE orders"):
+            updates.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_updates)
+    try:
+
+        async def scenario() -> list[bool]:
+            batcher = OrderStatusBatcher(TestingSessionLocal, max_delay_ms=10)
+            return await asyncio.gather(
+                batcher.submit(order_ids[0], OrderStatus.SHIPPED),
+                *(
+                    batcher.submit(order_id, OrderStatus.PAID)
+                    for order_id in order_ids[1:]
+                ),
+            )
+
+        results = asyncio.run(scenario())
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_updates)
+
+    assert results == [False, True, True, True]
+    assert len(updates) == 2
+    assert sorted(invalidated[0]) == sorted(str(order_id) for order_id in order_ids[1:])
+    statuses = asyncio.run(_statuses(order_ids))
+    assert statuses[order_ids[0]] == OrderStatus.PENDING
+    assert {statuses[order_id] for order_id in order_ids[1:]} == {OrderStatus.PAID}
+
+
+def test_batcher_flushes_when_batch_is_full(client: TestClient, monkeypatch) -> None:
+    _, token = _register_and_login(client)
+    order_ids = _create_orders(client, token, 2)
+
+    async def fake_invalidate(ids: list[str]) -> None:
+        return None
+
+    monkeypatch.setattr(order_processor, "invalidate_orders_cache", fake_invalidate)
+
+    async def scenario() -> list[bool]:
+        batcher = OrderStatusBatcher(
+            TestingSessionLocal,
+            max_batch_size=2,
+            max_delay_ms=60_000,
+        )
+        return await asyncio.wait_for(
+            asyncio.gather(
+                *(
+                    batcher.submit(order_id, OrderStatus.CANCELED)
+                    for order_id in order_ids
+                )
+            ),
+            timeout=5,
+        )
+
+    assert asyncio.run(scenario()) == [True, True]
+    assert set(asyncio.run(_statuses(order_ids)).values()) == {OrderStatus.CANCELED}
+
+
+def test_cancelled_submitter_does_not_cancel_the_batch(
+    client: TestClient,
+    monkeypatch,
+) -> None:
+    _, token = _register_and_login(client)
+    order_ids = _create_orders(client, token, 2)
+
+    async def slow_invalidate(ids: list[str]) -> None:
+        await asyncio.sleep(0.1)
+
+    monkeypatch.setattr(order_processor, "invalidate_orders_cache", slow_invalidate)
+
+    async def scenario() -> bool:
+        batcher = OrderStatusBatcher(
+            TestingSessionLocal,
+            max_batch_size=2,
+            max_delay_ms=60_000,
+        )
+        waiter = asyncio.create_task(batcher.submit(order_ids[0], OrderStatus.PAID))
+        await asyncio.sleep(0)
+        filler = asyncio.create_task(batcher.submit(order_ids[1], OrderStatus.PAID))
+        await asyncio.sleep(0.05)
+        filler.cancel()
+        return await asyncio.wait_for(waiter, timeout=5)
+
+    assert asyncio.run(scenario()) is True
+    assert set(asyncio.run(_statuses(order_ids)).values()) == {OrderStatus.PAID}
+
+
+def test_batcher_never_runs_two_flushes_at_once(
+    client: TestClient,
+    monkeypatch,
+) -> None:
+    _, token = _register_and_login(client)
+    order_ids = _create_orders(client, token, 4)
+    active = 0
+    overlapping = False
+
+    async def slow_invalidate(ids: list[str]) -> None:
+        nonlocal active, overlapping
+        active += 1
+        overlapping = overlapping or active > 1
+        await asyncio.sleep(0.05)
+        active -= 1
+
+    monkeypatch.setattr(order_processor, "invalidate_orders_cache", slow_invalidate)
+
+    async def scenario() -> list[bool]:
+        batcher = OrderStatusBatcher(
+            TestingSessionLocal,
+            max_batch_size=1,
+            max_delay_ms=60_000,
+        )
+        return await asyncio.wait_for(
+            asyncio.gather(
+                *(batcher.submit(order_id, OrderStatus.PAID) for order_id in order_ids)
+            ),
+            timeout=5,
+        )
+
+    assert asyncio.run(scenario()) == [True, True, True, True]
+    assert not overlapping
+
+
+def test_batcher_releases_waiters_when_flush_task_is_cancelled(
+    client: TestClient,
+    monkeypatch,
+) -> None:
+    _, token = _register_and_login(client)
+    order_ids = _create_orders(client, token, 2)
+
+    async def hanging_invalidate(ids: list[str]) -> None:
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(order_processor, "invalidate_orders_cache", hanging_invalidate)
+
+    async def scenario() -> None:
+        batcher = OrderStatusBatcher(
+            TestingSessionLocal,
+            max_batch_size=2,
+            max_delay_ms=60_000,
+        )
+        submitters = [
+            asyncio.create_task(batcher.submit(order_id, OrderStatus.PAID))
+            for order_id in order_ids
+        ]
+        await asyncio.sleep(0.1)
+        batcher._flush_task.cancel()
+        results = await asyncio.wait_for(
+            asyncio.gather(*submitters, return_exceptions=True),
+            timeout=5,
+        )
+        assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+    asyncio.run(scenario())
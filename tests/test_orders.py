@@ -1,5 +1,12 @@
+import json
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
 from fastapi.testclient import TestClient
 
+from src.order_management_service.services import order_service as order_service_module
+from tests.conftest import _ORDER_CACHE
+
 
 def _register_and_login(client: TestClient) -> tuple[int, str]:
     email = "orders@example.com"
@@ -110,5 +117,350 @@ def test_get_user_orders(client: TestClient) -> None:
         headers=_auth_headers(token),
     )
     assert list_response.status_code == 200
-    orders = list_response.json()
-    assert len(orders) == 3
+    page = list_response.json()
+    assert len(page["items"]) == 3
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.parametrize("cursor_by_id", [False, True])
+def test_get_user_orders_paginates_by_cursor(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+    cursor_by_id: bool,
+) -> None:
+    monkeypatch.setattr(order_service_module, "ORDERS_CURSOR_BY_ID", cursor_by_id)
+    user_id, token = _register_and_login(client)
+
+    created_ids = []
+    for _ in range(5):
+        response = client.post(
+            "/orders/",
+            json={
+                "items": [{"product_id": 1, "quantity": 1, "price": 10.0}],
+                "total_price": 10.0,
+            },
+            headers=_auth_headers(token),
+        )
+        assert response.status_code == 201
+        created_ids.append(response.json()["id"])
+
+    seen_ids = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(
+            f"/orders/user/{user_id}/",
+            params=params,
+            headers=_auth_headers(token),
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen_ids.extend(order["id"] for order in page["items"])
+        cursor = page["next_cursor"]
+        if cursor_by_id and cursor is not None:
+            assert cursor == seen_ids[-1]
+        if cursor is None:
+            break
+
+    assert seen_ids == list(reversed(created_ids))
+
+    bad_cursor = client.get(
+        f"/orders/user/{user_id}/",
+        params={"cursor": "not-a-cursor"},
+        headers=_auth_headers(token),
+    )
+    assert bad_cursor.status_code == 400
+
+
+def test_stream_user_orders_as_ndjson(client: TestClient) -> None:
+    user_id, token = _register_and_login(client)
+
+    for _ in range(3):
+        response = client.post(
+            "/orders/",
+            json={
+                "items": [{"product_id": 1, "quantity": 1, "price": 10.0}],
+                "total_price": 10.0,
+            },
+            headers=_auth_headers(token),
+        )
+        assert response.status_code == 201
+
+    stream_response = client.get(
+        f"/orders/user/{user_id}/stream",
+        headers=_auth_headers(token),
+    )
+    assert stream_response.status_code == 200
+    assert stream_response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in stream_response.text.splitlines()]
+    assert len(lines) == 3
+    assert all(order["user_id"] == user_id for order in lines)
+
+
+def test_create_orders_bulk_reports_per_item_results(client: TestClient) -> None:
+    user_id, token = _register_and_login(client)
+
+    bulk_payload = {
+        "orders": [
+            {
+                "items": [{"product_id": 1, "quantity": 1, "price": 10.0}],
+                "total_price": 10.0,
+            },
+            {"items": [{"product_id": "oops"}], "total_price": 5.0},
+            {
+                "items": [{"product_id": 2, "quantity": 3, "price": 2.0}],
+                "total_price": 6.0,
+            },
+        ],
+    }
+
+    response = client.post(
+        "/orders/bulk",
+        json=bulk_payload,
+        headers=_auth_headers(token),
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert results[0]["order"]["total_price"] == 10.0
+    assert results[1]["order"] is None
+    assert results[1]["errors"]
+    assert results[2]["order"]["total_price"] == 6.0
+    assert results[2]["order"]["user_id"] == user_id
+
+    get_response = client.get(
+        f"/orders/{results[2]['order']['id']}/",
+        headers=_auth_headers(token),
+    )
+    assert get_response.status_code == 200
+    assert get_response.json()["items"][0]["quantity"] == 3
+
+    list_response = client.get(
+        f"/orders/user/{user_id}/",
+        headers=_auth_headers(token),
+    )
+    assert len(list_response.json()["items"]) == 2
+
+
+def test_bulk_create_schema_documents_order_items(client: TestClient) -> None:
+    schema = client.get("/openapi.json").json()["components"]["schemas"]
+
+    assert schema["OrderBulkCreate"]["properties"]["orders"]["items"] == {
+        "$ref": "#/components/schemas/OrderCreate"
+    }
+
+
+def test_get_order_serves_cached_bytes_and_checks_owner(client: TestClient) -> None:
+    _, token = _register_and_login(client)
+    create_response = client.post(
+        "/orders/",
+        json={
+            "items": [{"product_id": 7, "quantity": 1, "price": 3.5}],
+            "total_price": 3.5,
+        },
+        headers=_auth_headers(token),
+    )
+    order = create_response.json()
+    _ORDER_CACHE.pop(order["id"], None)
+
+    miss_response = client.get(f"/orders/{order['id']}/", headers=_auth_headers(token))
+    hit_response = client.get(f"/orders/{order['id']}/", headers=_auth_headers(token))
+
+    assert miss_response.json() == order
+    assert hit_response.content == miss_response.content
+    assert hit_response.headers["content-type"] == "application/json"
+
+    client.post("/register/", json={"email": "other@example.com", "password": "x"})
+    other_token = client.post(
+        "/token/",
+        data={"username": "other@example.com", "password": "x"},
+    ).json()["access_token"]
+    forbidden = client.get(
+        f"/orders/{order['id']}/", headers=_auth_headers(other_token)
+    )
+    assert forbidden.status_code == 403
+
+
+def test_read_populate_policy_caches_on_first_read_only(
+    client: TestClient,
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(order_service_module, "ORDER_CACHE_POPULATE", "read")
+    _, token = _register_and_login(client)
+    order = client.post(
+        "/orders/",
+        json={
+            "items": [{"product_id": 1, "quantity": 1, "price": 2.0}],
+            "total_price": 2.0,
+        },
+        headers=_auth_headers(token),
+    ).json()
+    assert order["id"] not in _ORDER_CACHE
+
+    client.get(f"/orders/{order['id']}/", headers=_auth_headers(token))
+    assert order["id"] in _ORDER_CACHE
+
+    client.patch(
+        f"/orders/{order['id']}/",
+        json={"status": "PAID"},
+        headers=_auth_headers(token),
+    )
+    assert json.loads(_ORDER_CACHE[order["id"]].partition("\n")[2])["status"] == "PAID"
+    response = client.get(f"/orders/{order['id']}/", headers=_auth_headers(token))
+    assert response.json()["status"] == "PAID"
+
+
+def test_batch_get_orders_mixes_cache_hits_misses_and_missing(
+    client: TestClient,
+) -> None:
+    _, token = _register_and_login(client)
+    created = [
+        client.post(
+            "/orders/",
+            json={
+                "items": [{"product_id": i, "quantity": 1, "price": 1.0}],
+                "total_price": 1.0,
+            },
+            headers=_auth_headers(token),
+        ).json()
+        for i in range(3)
+    ]
+    _ORDER_CACHE.pop(created[1]["id"], None)
+    unknown_id = "00000000-0000-0000-0000-000000000000"
+
+    response = client.post(
+        "/orders/batch-get",
+        json={"ids": [order["id"] for order in created] + [unknown_id]},
+        headers=_auth_headers(token),
+    )
+    assert response.status_code == 200
+    assert response.json() == {"items": created, "missing": [unknown_id]}
+    assert created[1]["id"] in _ORDER_CACHE
+
+    client.post("/register/", json={"email": "other@example.com", "password": "x"})
+    other_token = client.post(
+        "/token/",
+        data={"username": "other@example.com", "password": "x"},
+    ).json()["access_token"]
+    forbidden = client.post(
+        "/orders/batch-get",
+        json={"ids": [created[0]["id"]]},
+        headers=_auth_headers(other_token),
+    )
+    assert forbidden.status_code == 403
+
+
+def test_update_order_statuses_in_bulk(client: TestClient) -> None:
+    _, token = _register_and_login(client)
+    created = [
+        client.post(
+            "/orders/",
+            json={
+                "items": [{"product_id": i, "quantity": 1, "price": 1.0}],
+                "total_price": 1.0,
+            },
+            headers=_auth_headers(token),
+        ).json()
+        for i in range(3)
+    ]
+    unknown_id = "00000000-0000-0000-0000-000000000000"
+
+    response = client.patch(
+        "/orders/status",
+        json={
+            "updates": [
+                {"id": created[0]["id"], "status": "PAID"},
+                {"id": created[2]["id"], "status": "CANCELED"},
+                {"id": unknown_id, "status": "PAID"},
+            ]
+        },
+        headers=_auth_headers(token),
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [(order["id"], order["status"]) for order in body["items"]] == [
+        (created[0]["id"], "PAID"),
+        (created[2]["id"], "CANCELED"),
+    ]
+    assert body["missing"] == [unknown_id]
+
+    statuses = [
+        client.get(f"/orders/{order['id']}/", headers=_auth_headers(token)).json()[
+            "status"
+        ]
+        for order in created
+    ]
+    assert statuses == ["PAID", "PENDING", "CANCELED"]
+
+
+def test_search_orders_filters_in_sql(client: TestClient) -> None:
+    _, token = _register_and_login(client)
+    created = [
+        client.post(
+            "/orders/",
+            json={
+                "items": [
+                    {"product_id": product_id, "quantity": 1, "price": 1.0}
+                    for product_id in product_ids
+                ],
+                "total_price": 1.0,
+            },
+            headers=_auth_headers(token),
+        ).json()
+        for product_ids in ([1, 2], [2], [3], [2, 3])
+    ]
+    client.patch(
+        f"/orders/{created[1]['id']}/",
+        json={"status": "PAID"},
+        headers=_auth_headers(token),
+    )
+
+    def search(**params) -> list[str]:
+        response = client.get(
+            "/orders/search",
+            params=params,
+            headers=_auth_headers(token),
+        )
+        assert response.status_code == 200
+        return [order["id"] for order in response.json()["items"]]
+
+    assert search(product_id=2) == [
+        created[3]["id"],
+        created[1]["id"],
+        created[0]["id"],
+    ]
+    assert search(product_id=2, status="PAID") == [created[1]["id"]]
+    assert search(product_id=4) == []
+    assert search(created_to=created[0]["created_at"]) == []
+    assert search(created_from=created[2]["created_at"]) == [
+        created[3]["id"],
+        created[2]["id"],
+    ]
+
+    created_from = datetime.fromisoformat(created[2]["created_at"])
+    assert search(created_from=f"{created_from.isoformat()}Z") == [
+        created[3]["id"],
+        created[2]["id"],
+    ]
+    shifted = created_from.replace(tzinfo=UTC).astimezone(timezone(timedelta(hours=3)))
+    assert search(created_to=shifted.isoformat()) == [
+        created[1]["id"],
+        created[0]["id"],
+    ]
+
+    first_page = client.get(
+        "/orders/search",
+        params={"product_id": 2, "limit": 2},
+        headers=_auth_headers(token),
+    ).json()
+    second_page = client.get(
+        "/orders/search",
+        params={"product_id": 2, "limit": 2, "cursor": first_page["next_cursor"]},
+        headers=_auth_headers(token),
+    ).json()
+    assert [order["id"] for order in second_page["items"]] == [created[0]["id"]]
+    assert second_page["next_cursor"] is None
@@ -0,0 +1,58 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from src.order_management_service.models.outbox import OrderOutbox
+from src.order_management_service.services.outbox_relay import relay_outbox_batch
+from tests.conftest import TestingSessionLocal, broker
+from tests.test_orders import _auth_headers, _register_and_login
+
+
+async def _outbox_size() -> int:
+    async with TestingSessionLocal() as session:
+        return await session.scalar(select(func.count()).select_from(OrderOutbox))
+
+
+async def _relay(batch_size: int) -> int:
+    async with TestingSessionLocal() as session:
+        return await relay_outbox_batch(session, batch_size=batch_size)
+
+
+def _create_orders(client: TestClient, token: str, count: int) -> list[str]:
+    order_ids = []
+    for _ in range(count):
+        response = client.post(
+            "/orders/",
+            json={
+                "items": [{"product_id": 1, "quantity": 1, "price": 10.0}],
+                "total_price": 10.0,
+            },
+            headers=_auth_headers(token),
+        )
+        assert response.status_code == 201
+        order_ids.append(response.json()["id"])
+    return order_ids
+
+
+def test_create_order_writes_outbox_event(client: TestClient) -> None:
+    _, token = _register_and_login(client)
+
+    _create_orders(client, token, 2)
+
+    assert asyncio.run(_outbox_size()) == 2
+    assert broker.messages == []
+
+
+def test_relay_publishes_outbox_in_batches(client: TestClient) -> None:
+    user_id, token = _register_and_login(client)
+    order_ids = _create_orders(client, token, 3)
+
+    assert asyncio.run(_relay(batch_size=2)) == 2
+    assert asyncio.run(_relay(batch_size=2)) == 1
+    assert asyncio.run(_relay(batch_size=2)) == 0
+
+    assert asyncio.run(_outbox_size()) == 0
+    assert [topic for topic, _, _ in broker.messages] == ["new_order"] * 3
+    assert [payload["order_id"] for _, _, payload in broker.messages] == order_ids
+    assert [key for _, key, _ in broker.messages] == [str(user_id)] * 3
@@ -0,0 +1,266 @@
+import asyncio
+import gc
+import time
+from types import SimpleNamespace
+from typing import Annotated, Self
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.order_management_service.core import rate_limiter as rate_limiter_module
+from src.order_management_service.core.metrics import rate_limit_rejections_total
+from src.order_management_service.core.rate_limiter import RateLimiter
+from src.order_management_service.core.redis import redis_client
+
+
+class _FakeScript:
+    def __init__(self, results: list[list[int]]) -> None:
+        self.results = results
+        self.calls: list[tuple[list[str], list]] = []
+
+    async def __call__(self, keys: list[str], args: list) -> list[int]:
+        self.calls.append((keys, args))
+        return self.results.pop(0)
+
+
+def _client_for(limiter: RateLimiter) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/limited")
+    async def limited(_rate_limit: Annotated[None, Depends(limiter)]) -> dict:
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_rate_limiter_sets_headers_on_allowed_request() -> None:
+    limiter = RateLimiter("orders", requests=5, window_seconds=60)
+    limiter._script = _FakeScript([[1, 4, 0, 60000]])
+
+    response = _client_for(limiter).get("/limited")
+
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Limit"] == "5"
+    assert response.headers["X-RateLimit-Remaining"] == "4"
+    assert response.headers["X-RateLimit-Reset"] == "60"
+    keys, args = limiter._script.calls[0]
+    assert keys == ["rate:orders:testclient"]
+    assert args[:2] == [5, 60000]
+
+
+def test_rate_limiter_rejects_with_retry_after() -> None:
+    limiter = RateLimiter(
+        "login", requests=1, window_seconds=60, algorithm="token_bucket"
+    )
+    limiter._script = _FakeScript([[0, 0, 1500, 59000]])
+    rejected = rate_limit_rejections_total.value("login")
+
+    response = _client_for(limiter).get("/limited")
+
+    assert response.status_code == 429
+    assert rate_limit_rejections_total.value("login") == rejected + 1
+    assert response.headers["Retry-After"] == "2"
+    assert response.headers["X-RateLimit-Remaining"] == "0"
+
+
+@pytest.fixture
+def fake_redis_server(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    from fakeredis.aioredis import FakeConnection
+    from redis.asyncio import ConnectionPool
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis_client,
+        "connection_pool",
+        ConnectionPool(
+            connection_class=FakeConnection, server=server, decode_responses=True
+        ),
+    )
+    return server
+
+
+@pytest.mark.parametrize(
+    "algorithm", ["sliding_window", "token_bucket", "fixed_window"]
+)
+def test_rate_limiter_scripts_limit_and_reset(
+    fake_redis_server, algorithm: str
+) -> None:
+    limiter = RateLimiter("lua", requests=2, window_seconds=1, algorithm=algorithm)
+
+    with _client_for(limiter) as client:
+        first, second, rejected = (client.get("/limited") for _ in range(3))
+
+        assert [first.status_code, second.status_code] == [200, 200]
+        assert first.headers["X-RateLimit-Remaining"] == "1"
+        assert second.headers["X-RateLimit-Remaining"] == "0"
+        assert second.headers["X-RateLimit-Reset"] == "1"
+        assert rejected.status_code == 429
+        assert rejected.headers["Retry-After"] == "1"
+        assert rejected.headers["X-RateLimit-Remaining"] == "0"
+
+        time.sleep(1.05)
+        assert client.get("/limited").status_code == 200
+
+
+def test_rate_limiter_rejects_unknown_algorithm() -> None:
+    with pytest.raises(ValueError):
+        RateLimiter("orders", requests=1, window_seconds=1, algorithm="fixed")
+
+
+def test_hybrid_mode_requires_fixed_window() -> None:
+    with pytest.raises(ValueError):
+        RateLimiter("hybrid", requests=1, window_seconds=1, mode="hybrid")
+
+
+def test_discarded_hybrid_limiters_are_not_synced() -> None:
+    limiter = RateLimiter(
+        "discarded",
+        requests=1,
+        window_seconds=1,
+        mode="hybrid",
+        algorithm="fixed_window",
+    )
+    assert limiter in rate_limiter_module._hybrid_limiters
+
+    del limiter
+    gc.collect()
+
+    assert all(
+        limiter.name != "discarded" for limiter in rate_limiter_module._hybrid_limiters
+    )
+
+
+class _FakePipeline:
+    def __init__(self, store: dict[str, int], log: list[str], delay: float = 0) -> None:
+        self.store = store
+        self.log = log
+        self.delay = delay
+        self.commands: list[tuple[str, str, int]] = []
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    def incrby(self, key: str, amount: int) -> None:
+        self.commands.append(("incrby", key, amount))
+
+    def expire(self, key: str, seconds: int) -> None:
+        self.commands.append(("expire", key, seconds))
+
+    async def execute(self) -> list[int]:
+        self.log.append("execute")
+        await asyncio.sleep(self.delay)
+        results = []
+        for command, key, value in self.commands:
+            if command == "incrby":
+                self.store[key] = self.store.get(key, 0) + value
+                results.append(self.store[key])
+            else:
+                results.append(1)
+        return results
+
+
+class _FakeRedis:
+    def __init__(self, delay: float = 0) -> None:
+        self.store: dict[str, int] = {}
+        self.round_trips: list[str] = []
+        self.delay = delay
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self.store, self.round_trips, self.delay)
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch) -> None:
+    # Hybrid windows are aligned to wall-clock time; keep the tests away from
+    # a window boundary.
+    monkeypatch.setattr(
+        rate_limiter_module,
+        "time",
+        SimpleNamespace(time=lambda: 1_800_000_000.0),
+    )
+
+
+def test_hybrid_limiter_admits_locally_and_reconciles_in_batches(
+    monkeypatch,
+    frozen_clock,
+) -> None:
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(rate_limiter_module, "redis_client", fake_redis)
+    limiter = RateLimiter(
+        "hybrid",
+        requests=20,
+        window_seconds=3600,
+        mode="hybrid",
+        algorithm="fixed_window",
+        tolerance=0.25,
+    )
+    client = _client_for(limiter)
+
+    statuses = [client.get("/limited").status_code for _ in range(20)]
+
+    assert statuses == [200] * 20
+    assert len(fake_redis.round_trips) == 3
+    assert client.get("/limited").status_code == 429
+
+
+def test_hybrid_limiter_sees_other_workers_after_sync(
+    monkeypatch, frozen_clock
+) -> None:
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(rate_limiter_module, "redis_client", fake_redis)
+    limiter = RateLimiter(
+        "hybrid",
+        requests=10,
+        window_seconds=3600,
+        mode="hybrid",
+        algorithm="fixed_window",
+        tolerance=0.2,
+    )
+    client = _client_for(limiter)
+
+    assert client.get("/limited").status_code == 200
+    for key in list(limiter._local):
+        fake_redis.store[f"{key}:{limiter._local[key].window}"] = 9
+
+    asyncio.run(limiter.sync())
+
+    response = client.get("/limited")
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+
+
+def test_hybrid_limiter_never_sends_pending_hits_twice(
+    monkeypatch, frozen_clock
+) -> None:
+    fake_redis = _FakeRedis(delay=0.01)
+    monkeypatch.setattr(rate_limiter_module, "redis_client", fake_redis)
+    limiter = RateLimiter(
+        "hybrid",
+        requests=100,
+        window_seconds=3600,
+        mode="hybrid",
+        algorithm="fixed_window",
+        tolerance=0.1,
+    )
+    key = "rate:hybrid:10.0.0.1"
+
+    async def scenario() -> None:
+        for _ in range(10):
+            await limiter._check_local(key)
+        await asyncio.gather(
+            *(limiter._check_local(key) for _ in range(20)),
+            limiter.sync(),
+        )
+        await limiter.sync()
+
+    asyncio.run(scenario())
+
+    state = limiter._local[key]
+    assert fake_redis.store == {f"{key}:{state.window}": 30}
+    assert (state.synced, state.pending, state.in_flight) == (30, 0, 0)
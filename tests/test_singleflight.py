@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from src.order_management_service.core.redis import should_refresh_early
+from src.order_management_service.core.singleflight import SingleFlight
+
+
+def test_single_flight_coalesces_concurrent_calls() -> None:
+    calls = 0
+
+    async def load() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "order"
+
+    async def scenario() -> list[str]:
+        flight: SingleFlight[str] = SingleFlight()
+        return await asyncio.gather(*(flight.do("order:1", load) for _ in range(10)))
+
+    assert asyncio.run(scenario()) == ["order"] * 10
+    assert calls == 1
+
+
+def test_single_flight_shares_errors_and_then_retries() -> None:
+    calls = 0
+
+    async def failing_load() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise LookupError("missing")
+
+    async def scenario() -> None:
+        flight: SingleFlight[str] = SingleFlight()
+        results = await asyncio.gather(
+            *(flight.do("order:1", failing_load) for _ in range(3)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, LookupError) for result in results)
+        with pytest.raises(LookupError):
+            await flight.do("order:1", failing_load)
+
+    asyncio.run(scenario())
+    assert calls == 2
+
+
+def test_single_flight_waiters_survive_a_cancelled_leader() -> None:
+    calls = 0
+
+    async def load() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "order"
+
+    async def scenario() -> list[str]:
+        flight: SingleFlight[str] = SingleFlight()
+        leader = asyncio.create_task(flight.do("order:1", load))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(flight.do("order:1", load)) for _ in range(3)]
+        await asyncio.sleep(0.005)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(scenario()) == ["order"] * 3
+    assert calls == 2
+
+
+def test_early_refresh_only_near_expiry() -> None:
+    assert not any(should_refresh_early(300, 0.01) for _ in range(1000))
+    assert all(should_refresh_early(0.0, 0.01) for _ in range(1000))
@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+
+from src.order_management_service.core import sql_profiler
+from src.order_management_service.core.sql_profiler import QueryProfile
+from tests.test_orders import _auth_headers, _register_and_login
+
+
+def test_query_profile_keeps_slowest_and_flags_repeats(monkeypatch) -> None:
+    monkeypatch.setattr(sql_profiler, "SQL_PROFILE_SLOWEST", 2)
+    monkeypatch.setattr(sql_profiler, "SQL_N_PLUS_ONE_THRESHOLD", 3)
+    profile = QueryProfile()
+
+    for elapsed in (0.001, 0.002, 0.003):
+        profile.record("SELECT * FROM users WHERE id = ?", elapsed)
+    profile.record("SELECT * FROM orders", 0.010)
+
+    summary = profile.summary()
+    assert summary["count"] == 4
+    assert summary["total_ms"] == 16.0
+    assert [entry["ms"] for entry in summary["slowest"]] == [10.0, 3.0]
+    assert summary["n_plus_one"] == [
+        {"statement": "SELECT * FROM users WHERE id = ?", "count": 3}
+    ]
+
+
+def test_profiling_middleware_reports_request_queries(
+    client: TestClient,
+    monkeypatch,
+) -> None:
+    _, token = _register_and_login(client)
+    monkeypatch.setattr(sql_profiler, "SQL_PROFILING_ENABLED", True)
+
+    response = client.post(
+        "/register/",
+        json={"email": "profiled@example.com", "password": "x"},
+    )
+
+    assert response.status_code == 201
+    assert int(response.headers["x-db-query-count"]) >= 2
+    assert float(response.headers["x-db-query-time-ms"]) > 0
+
+    profiles = client.get("/internal/db/queries", headers=_auth_headers(token)).json()
+    register_profile = next(p for p in profiles if p["path"] == "/register/")
+    assert register_profile["count"] == int(response.headers["x-db-query-count"])
+    assert any(
+        "INSERT INTO users" in entry["statement"]
+        for entry in register_profile["slowest"]
+    )
+
+
+def test_profiling_is_off_by_default(client: TestClient) -> None:
+    response = client.get("/health")
+
+    assert "x-db-query-count" not in response.headers